@@ -0,0 +1,166 @@
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import first_reportes
+import tests_cases
+from data_loader import iter_excel_chunks, load_sales
+
+'''@uthor: José Luis García Quinayás
+City: Popayán - Cauca
+Date: 18/Oct/2026'''
+
+# Extensiones de los archivos de ventas que se buscan dentro de una carpeta
+SOURCE_EXTENSIONS = ('.xlsx', '.xlsm')
+
+# Hojas de test_report.xlsx con el detalle por archivo
+CASES_SHEET = "Casos por archivo"
+REPORTS_SHEET = "Reportes por archivo"
+
+def expand_sources(sources):
+    """Lista ordenada y sin repetidos de los archivos de ventas de `sources` (carpetas, patrones glob o archivos)."""
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            matches = [os.path.join(source, name) for name in os.listdir(source)
+                       if name.lower().endswith(SOURCE_EXTENSIONS)]
+        else:
+            matches = glob.glob(source) if glob.has_magic(source) else [source]
+        # Los archivos "~$..." son los temporales que deja Excel abierto
+        paths.extend(path for path in matches if not os.path.basename(path).startswith('~$'))
+    return sorted(set(os.path.abspath(path) for path in paths))
+
+### Validación de una partición (corre en un proceso del pool)
+
+def validate_partition(path, use_cache=True, chunk_size=None):
+    """Evalúa los casos de tests_cases.py y los criterios de first_reportes.py sobre un archivo.
+
+    Devuelve sólo conteos, que son pequeños de enviar al proceso principal. Con `chunk_size` el
+    archivo se recorre por bloques y la memoria del proceso depende del bloque y no del archivo.
+    """
+    started = time.perf_counter()
+    incidents = pd.Series(0, index=tests_cases.PLAN["cases"])
+    criterios = pd.Series(0, index=list(first_reportes.REPORT_FILES))
+    errors = {}
+    rows = 0
+    chunks = iter_excel_chunks(path, chunk_size) if chunk_size else [load_sales(path, use_cache)]
+    for chunk in chunks:
+        chunk = tests_cases.convert_numeric_columns(chunk)
+        matrix, chunk_errors = tests_cases.build_violation_matrix(chunk)
+        incidents += matrix.sum()
+        for test_id, error in chunk_errors.items():
+            errors.setdefault(test_id, error)
+        criterios += first_reportes.build_report_matrix(chunk).sum()
+        rows += len(chunk)
+    return {"path": path, "rows": rows, "incidents": incidents.astype(int).to_dict(), "errors": errors,
+            "criterios": criterios.astype(int).to_dict(), "seconds": round(time.perf_counter() - started, 3)}
+
+def _failed_partition(path, error):
+    return {"path": path, "rows": 0, "incidents": {}, "errors": {}, "criterios": {}, "seconds": None,
+            "failure": f"{type(error).__name__}: {error}"}
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        # El archivo se envía igual al pool, donde su error queda registrado como "failure"
+        return 0
+
+def validate_partitions(paths, workers=0, use_cache=True, chunk_size=None):
+    """Valida cada archivo en un proceso del pool (0 = uno por núcleo) y devuelve sus resultados en orden.
+
+    Cada proceso atiende un único archivo y luego se reemplaza, así la memoria de un archivo
+    grande se libera antes del siguiente. Un archivo que no se puede leer queda marcado con
+    "failure" sin detener a los demás.
+    """
+    results = {}
+    # Los archivos más grandes primero, para repartir mejor la carga entre procesos
+    pending = sorted(paths, key=_file_size, reverse=True)
+    with ProcessPoolExecutor(max_workers=workers or None, max_tasks_per_child=1) as pool:
+        futures = {path: pool.submit(validate_partition, path, use_cache, chunk_size) for path in pending}
+        for path, future in futures.items():
+            try:
+                results[path] = future.result()
+            except Exception as e:
+                results[path] = _failed_partition(path, e)
+            print(f"Validado: {path} - {results[path]['rows']} filas")
+    return [results[path] for path in paths]
+
+### Consolidación de los resultados
+
+def merge_partitions(results):
+    """Suma los incidentes y los conteos de todos los archivos; el primer error de cada caso se conserva."""
+    incidents = pd.Series(0, index=tests_cases.PLAN["cases"])
+    criterios = pd.Series(0, index=list(first_reportes.REPORT_FILES))
+    errors = {}
+    for result in results:
+        incidents = incidents.add(pd.Series(result["incidents"], dtype=int), fill_value=0)
+        criterios = criterios.add(pd.Series(result["criterios"], dtype=int), fill_value=0)
+        for test_id, error in result["errors"].items():
+            errors.setdefault(test_id, error)
+    criterios_reporte = {label: int(criterios[label]) for label in first_reportes.REPORT_FILES}
+    return incidents[tests_cases.PLAN["cases"]].astype(int), errors, criterios_reporte
+
+def write_breakdown_sheets(wb, results):
+    """Agrega al libro una hoja con los incidentes de cada caso y otra con los criterios, por archivo."""
+    for title, key, columns in [(CASES_SHEET, "incidents", tests_cases.PLAN["cases"]),
+                                (REPORTS_SHEET, "criterios", list(first_reportes.REPORT_FILES))]:
+        if title in wb.sheetnames:
+            del wb[title]
+        ws = wb.create_sheet(title)
+        ws.append(["Archivo", "Filas", "Tiempo (s)"] + columns + ["Observaciones"])
+        for result in results:
+            notes = result.get("failure") or "; ".join(f"{test_id}: {error}"
+                                                       for test_id, error in result["errors"].items())
+            ws.append([result["path"], result["rows"], result["seconds"]]
+                      + [result[key].get(column) for column in columns] + [notes])
+
+def run_batch(sources, path=tests_cases.report_path, workers=0, use_cache=True, chunk_size=None):
+    """Valida todos los archivos de `sources` y guarda el test_report consolidado.
+
+    Devuelve (criterios_reporte, archivos que no se pudieron validar). Si algún archivo falla,
+    todos los casos quedan como "Fallido": sus datos no se revisaron y no pueden darse por aprobados.
+    """
+    paths = expand_sources(sources)
+    if not paths:
+        raise FileNotFoundError(f"No se encontraron archivos de ventas en: {', '.join(sources)}")
+    results = validate_partitions(paths, workers, use_cache, chunk_size)
+    incidents, errors, criterios_reporte = merge_partitions(results)
+    failed = [result["path"] for result in results if result.get("failure")]
+
+    tests_cases.ws['A3'] = f"Descripción de las Pruebas: Pruebas a los datos de {len(paths)} archivos de ventas"
+    for row in tests_cases.case_results(incidents, errors):
+        if failed:
+            row[2] = "Fallido"
+            row[5] = "; ".join(filter(None, [row[5], f"{len(failed)} archivo(s) sin validar "
+                                                       f"(ver hoja {CASES_SHEET})"]))
+        tests_cases.record_result(*row)
+    write_breakdown_sheets(tests_cases.wb, results)
+    tests_cases.wb.save(path)
+    if failed:
+        print(f"Archivos que no se pudieron validar: {', '.join(failed)}")
+    return criterios_reporte, failed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validación de varios archivos de ventas en paralelo")
+    parser.add_argument("sources", nargs="+",
+                        help="Carpetas, patrones glob (p. ej. 'ventas/*_2026-0[1-3].xlsx') o archivos")
+    parser.add_argument("--report", default=tests_cases.report_path, help="Ruta del reporte Excel consolidado")
+    parser.add_argument("--workers", type=int, default=0, help="Procesos del pool (0 = uno por núcleo)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Leer cada archivo en bloques de N filas para acotar la memoria de cada proceso")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Leer siempre el Excel en lugar de la caché columnar")
+    args = parser.parse_args()
+
+    criterios_reporte, failed = run_batch(args.sources, args.report, args.workers, not args.no_cache,
+                                          args.chunk_size)
+    print(f"Reporte guardado en {args.report}")
+    print("Criterios y conteos de cada reporte:", criterios_reporte)
+    # Código de salida 1 si algún archivo no se pudo validar
+    sys.exit(1 if failed else 0)
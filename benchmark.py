@@ -0,0 +1,231 @@
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import numpy as np
+import pandas as pd
+
+import first_reportes
+import tests_cases
+from data_loader import column_descriptions, iter_excel_chunks, load_sales, to_categorical
+from number_parsing import normalize_numeric_columns
+from profiling import instrument
+from report_writer import write_xlsx
+
+'''@uthor: José Luis García Quinayás
+City: Popayán - Cauca
+Date: 18/Oct/2026'''
+
+# Tamaños por defecto (filas); 10M se puede pedir con --sizes
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+# Una hoja de Excel admite como máximo 1.048.576 filas; por encima sólo se mide desde la caché
+EXCEL_MAX_ROWS = 1_048_575
+
+### Generador de ventas sintéticas con el esquema de ventas1.xlsx
+
+PRODUCTS = {
+    'Laptop': 'Computación', 'Tablet': 'Computación', 'Mouse': 'Accesorios', 'Teclado': 'Accesorios',
+    'Cámara': 'Fotografía', 'Televisor': 'Electrónica', 'Teléfono': 'Electrónica',
+    'Audífonos': 'Audio', 'Parlante': 'Audio', 'Escritorio': 'Oficina',
+}
+CLIENTS = ['Juan Perez', 'Maria Lopez', 'Carlos Gomez', 'Ana Diaz', 'Luis Rodriguez', 'Sofia Torres']
+REGIONS = ['Norte', 'Sur', 'Este', 'Oeste', 'Centro']
+PAYMENT_METHODS = ['Efectivo', 'Transferencia Bancaria', 'Tarjeta de Credito', 'PayPal']
+
+# Variantes con números, acentos mal codificados o símbolos para los campos de texto
+SPECIAL_VARIANTS = {
+    'nombre_producto': ['TelÃ©fono', 'CÃ¡mara', 'Laptop-15', 'Mouse#2'],
+    'categoria': ['ElectrÃ³nica', 'ComputaciÃ³n', 'Audio!', 'Oficina 2'],
+    'nombre_cliente': ['MarÃ­a LÃ³pez', 'Juan PÃ©rez', 'Ana D1az', 'Luis_Rodriguez'],
+    'region': ['Nort3', 'Sur*', 'Este.'],
+    'metodo_pago': ['Tarjeta de CrÃ©dito', 'Pay-Pal', 'Efectivo$'],
+}
+
+# Columnas que admiten nulos según column_descriptions
+NULLABLE_COLUMNS = ['fecha_venta', 'nombre_producto', 'categoria', 'precio', 'nombre_cliente', 'region', 'metodo_pago']
+
+def generate_sales(rows, seed=0, null_rate=0.01, negative_price_rate=0.08, special_char_rate=0.3,
+                   inconsistent_total_rate=0.05, currency_text_rate=0.04):
+    """Genera `rows` ventas sintéticas con las diez columnas de column_descriptions.
+
+    Las tasas controlan la fracción de filas con nulos (por columna), precios negativos, caracteres
+    especiales (por columna de texto), total_venta inconsistente y precios escritos como "$1,234.50".
+    """
+    rng = np.random.default_rng(seed)
+    products = np.array(list(PRODUCTS), dtype=object)
+    product = products[rng.integers(0, len(products), rows)]
+
+    days = rng.integers(0, 730, rows)
+    fecha = (np.datetime64('2023-01-01') + days).astype(str).astype(object)
+    precio = np.round(rng.uniform(1, 1000, rows), 2)
+    precio[rng.random(rows) < negative_price_rate] *= -1
+    cantidad = rng.integers(1, 20, rows)
+    total = np.round(precio * cantidad, 2)
+    inconsistent = rng.random(rows) < inconsistent_total_rate
+    total[inconsistent] += np.round(rng.uniform(1, 50, inconsistent.sum()), 2)
+
+    data = pd.DataFrame({
+        'fecha_venta': fecha,
+        'id_producto': rng.integers(1000, 10000, rows),
+        'nombre_producto': product,
+        'categoria': pd.Series(product).map(PRODUCTS).to_numpy(dtype=object),
+        'precio': precio.astype(object),
+        'cantidad_vendida': cantidad,
+        'total_venta': total,
+        'nombre_cliente': np.array(CLIENTS, dtype=object)[rng.integers(0, len(CLIENTS), rows)],
+        'region': np.array(REGIONS, dtype=object)[rng.integers(0, len(REGIONS), rows)],
+        'metodo_pago': np.array(PAYMENT_METHODS, dtype=object)[rng.integers(0, len(PAYMENT_METHODS), rows)],
+    })
+
+    as_text = rng.random(rows) < currency_text_rate
+    data.loc[as_text, 'precio'] = ['${:,.2f}'.format(value) for value in precio[as_text]]
+    for column, variants in SPECIAL_VARIANTS.items():
+        dirty = rng.random(rows) < special_char_rate
+        data.loc[dirty, column] = np.array(variants, dtype=object)[rng.integers(0, len(variants), dirty.sum())]
+    for column in NULLABLE_COLUMNS:
+        data.loc[rng.random(rows) < null_rate, column] = None
+    return data[list(column_descriptions)]
+
+### Medición
+
+def measure(results, size, phase, func, rows=None, trace_memory=True):
+    """Ejecuta `func` sin mostrar su salida y agrega a `results` tiempo, CPU, filas/s y memoria.
+
+    La memoria es el máximo asignado durante la fase según tracemalloc (profiling.instrument), así
+    que cada fase muestra su propio consumo aunque no supere el pico anterior del proceso; tracemalloc
+    hace las fases más lentas. Con `trace_memory=False` se mide cuánto creció el pico de RSS, que no
+    afecta los tiempos pero vale 0 en las fases que no superan un pico anterior.
+    """
+    rows = size if rows is None else rows
+    metrics = []
+    with contextlib.redirect_stdout(io.StringIO()), instrument(metrics, phase, rows, trace_memory=trace_memory):
+        value = func()
+    metric = metrics[0]
+    results.append({
+        "size": size,
+        "phase": phase,
+        "wall_s": metric["wall_s"],
+        "cpu_s": metric["cpu_s"],
+        "rows": rows,
+        "rows_per_s": round(rows / metric["wall_s"], 1) if metric["wall_s"] > 0 else None,
+        "peak_mb": metric["peak_mb"],
+        "memory": "tracemalloc" if trace_memory else "rss",
+    })
+    return value
+
+# Funciones de reporte de first_reportes.py y sus argumentos
+REPORT_FUNCTIONS = [
+    ("report_missing_fields:fecha_venta", first_reportes.report_missing_fields, ('fecha_venta',)),
+    ("report_missing_fields:id_producto", first_reportes.report_missing_fields, ('id_producto',)),
+    ("report_missing_fields:nombre_producto", first_reportes.report_missing_fields, ('nombre_producto',)),
+    ("report_missing_fields:categoria", first_reportes.report_missing_fields, ('categoria',)),
+    ("report_negative_precio", first_reportes.report_negative_precio, ()),
+    ("report_negative_cantidad_vendida", first_reportes.report_negative_cantidad_vendida, ()),
+    ("report_inconsistent_total_venta", first_reportes.report_inconsistent_total_venta, ()),
+    ("report_special_characters:nombre_producto", first_reportes.report_special_characters, ('nombre_producto',)),
+    ("report_special_characters:nombre_cliente", first_reportes.report_special_characters, ('nombre_cliente',)),
+    ("report_valid_categoria", first_reportes.report_valid_categoria, (first_reportes.valid_categories,)),
+    ("report_invalid_categoria", first_reportes.report_invalid_categoria, ()),
+    ("report_special_characters_metodo_pago", first_reportes.report_special_characters_metodo_pago, ()),
+]
+
+def benchmark_size(size, work_dir, seed=0, max_excel_rows=EXCEL_MAX_ROWS, max_write_rows=100_000,
+                   large_format="csv", trace_memory=True, **rates):
+    """Mide carga, cada caso de tests_cases.py, cada reporte y la escritura para un tamaño.
+
+    Por encima de `max_write_rows` los reportes se escriben en `large_format` ('csv' o 'parquet')
+    en lugar de Excel, así que todos los tamaños miden las mismas fases.
+    """
+    results = []
+
+    def timed(phase, func, rows=None):
+        return measure(results, size, phase, func, rows, trace_memory)
+
+    # Cada tamaño parte de un reporte sin filas de casos, para que save_test_report sea comparable
+    tests_cases.ws.delete_rows(tests_cases.RESULTS_START_ROW, tests_cases.ws.max_row)
+    data = timed("generate", lambda: generate_sales(size, seed, **rates))
+
+    source = os.path.join(work_dir, f"ventas_{size}.xlsx")
+    if size <= min(max_excel_rows, EXCEL_MAX_ROWS):
+        timed("write_source_excel", lambda: write_xlsx(data, source))
+        timed("load_excel", lambda: pd.read_excel(source, engine='openpyxl'))
+        timed("load_chunks", lambda: sum(len(chunk) for chunk in iter_excel_chunks(source)))
+        # La caché de los archivos sintéticos queda en la carpeta temporal y no en la del usuario
+        cache_dir = os.path.join(work_dir, "cache")
+        timed("load_cache_build", lambda: load_sales(source, cache_dir=cache_dir))
+        data = timed("load_cache_hit", lambda: load_sales(source, cache_dir=cache_dir))
+    else:
+        # Sin Excel de origen se aplican las mismas conversiones que load_sales (columnas categóricas)
+        data = timed("to_categorical", lambda: to_categorical(data))
+
+    timed("normalize_numeric", lambda: normalize_numeric_columns(data))
+    for case in tests_cases.CASES:
+        timed(f"validate:{case['test_id']}", lambda case=case: tests_cases.validate_case(case['test_id'], data))
+    timed("validate:plan_completo", lambda: tests_cases.build_violation_matrix(data))
+    timed("save_test_report", lambda: tests_cases.wb.save(os.path.join(work_dir, f"test_report_{size}.xlsx")))
+
+    timed("report_masks", lambda: first_reportes.build_report_matrix(data))
+    first_reportes.output_dir = work_dir
+    first_reportes.report_format = "xlsx" if size <= min(max_write_rows, EXCEL_MAX_ROWS) else large_format
+    for name, function, args in REPORT_FUNCTIONS:
+        timed(f"{name} ({first_reportes.report_format})", lambda function=function, args=args: function(data, *args))
+    return results
+
+def code_version():
+    """Commit actual del repositorio, para comparar resultados entre versiones."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def save_results(results, output):
+    """Guarda los resultados en JSON o CSV según la extensión de `output`."""
+    version = {"version": code_version(), "python": platform.python_version(), "pandas": pd.__version__}
+    if output.endswith(".csv"):
+        with open(output, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(version) + list(results[0]))
+            writer.writeheader()
+            for row in results:
+                writer.writerow(dict(version, **row))
+    else:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(dict(version, results=results), f, indent=2, ensure_ascii=False)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de carga, validación y reportes con ventas sintéticas")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Tamaños en filas")
+    parser.add_argument("--output", default="bench_results.json", help="Archivo de resultados (.json o .csv)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-excel-rows", type=int, default=EXCEL_MAX_ROWS,
+                        help="Tamaño máximo para el que se genera y se lee un Excel de origen")
+    parser.add_argument("--max-write-rows", type=int, default=100_000,
+                        help="Tamaño máximo para el que se escriben los reportes en Excel")
+    parser.add_argument("--large-format", choices=["csv", "parquet"], default="csv",
+                        help="Formato de los reportes por encima de --max-write-rows")
+    parser.add_argument("--rss-memory", action="store_true",
+                        help="Medir la memoria con el pico de RSS en lugar de tracemalloc (tiempos sin sobrecarga)")
+    parser.add_argument("--null-rate", type=float, default=0.01)
+    parser.add_argument("--negative-price-rate", type=float, default=0.08)
+    parser.add_argument("--special-char-rate", type=float, default=0.3)
+    parser.add_argument("--inconsistent-total-rate", type=float, default=0.05)
+    parser.add_argument("--currency-text-rate", type=float, default=0.04)
+    args = parser.parse_args()
+
+    rates = {"null_rate": args.null_rate, "negative_price_rate": args.negative_price_rate,
+             "special_char_rate": args.special_char_rate, "inconsistent_total_rate": args.inconsistent_total_rate,
+             "currency_text_rate": args.currency_text_rate}
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in args.sizes:
+            print(f"Midiendo {size} filas...")
+            results.extend(benchmark_size(size, work_dir, args.seed, args.max_excel_rows, args.max_write_rows,
+                                          args.large_format, not args.rss_memory, **rates))
+    save_results(results, args.output)
+    print(f"Resultados guardados en {args.output}")
@@ -0,0 +1,212 @@
+import argparse
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+from data_loader import cache_file, load_sales, load_state_file, save_state_file
+from date_parsing import parse_dates
+from incremental import row_fingerprints
+from number_parsing import normalize_numeric_columns
+
+'''@uthor: José Luis García Quinayás
+City: Popayán - Cauca
+Date: 18/Oct/2026'''
+
+# Diferencia absoluta máxima aceptada entre total_venta y precio * cantidad_vendida (redondeo a centavos)
+DEFAULT_TOLERANCE = 0.01
+
+# Estado de cada fila
+STATUS_OK = 0            # total_venta coincide dentro de la tolerancia
+STATUS_INCONSISTENT = 1  # total_venta difiere más que la tolerancia
+STATUS_INCOMPLETE = 2    # falta precio, cantidad_vendida o total_venta, o no son números
+
+# Claves del índice agregado y valores para filas sin dato en la clave
+INDEX_KEYS = ['id_producto', 'region', 'dia']
+MISSING_KEYS = {'id_producto': -1, 'region': "(sin región)", 'dia': "(sin fecha)"}
+
+# Métricas que se suman por clave; se pueden restar al salir filas, así que el índice se actualiza por diferencias
+INDEX_METRICS = ['filas', 'inconsistentes', 'incompletas', 'desviacion', 'desviacion_absoluta']
+
+# El estado guarda una fila por cada fila distinta del archivo (crece con el archivo), repartida en
+# ROW_SHARDS archivos según su huella: cada actualización reescribe sólo los fragmentos con filas que
+# entran o salen. El índice agregado va en su propio archivo y se consulta sin leer las filas
+ROW_SHARDS = 16
+
+def check_total_venta(data, tolerance=DEFAULT_TOLERANCE, rel_tolerance=0.0):
+    """Compara total_venta con precio * cantidad_vendida sin recorrer las filas una por una.
+
+    Una fila es inconsistente si la diferencia supera `tolerance` o, si es mayor, `rel_tolerance`
+    veces el total esperado. Las filas con algún valor nulo o no numérico quedan como incompletas
+    en lugar de inconsistentes. Devuelve un DataFrame con 'esperado', 'desviacion' y 'estado'.
+    """
+    precio, cantidad, total = (pd.to_numeric(data[column], errors='coerce').to_numpy(dtype=float)
+                               for column in ['precio', 'cantidad_vendida', 'total_venta'])
+    expected = precio * cantidad
+    deviation = total - expected
+    incomplete = np.isnan(deviation)
+    allowed = np.maximum(tolerance, rel_tolerance * np.abs(expected))
+    status = np.full(len(data), STATUS_OK, dtype=np.int8)
+    status[~incomplete & (np.abs(deviation) > allowed)] = STATUS_INCONSISTENT
+    status[incomplete] = STATUS_INCOMPLETE
+    return pd.DataFrame({'esperado': expected, 'desviacion': deviation, 'estado': status}, index=data.index)
+
+### Índice agregado por producto, región y día
+
+def row_contributions(data, tolerance=DEFAULT_TOLERANCE, rel_tolerance=0.0):
+    """Clave del índice y aporte de cada fila a las métricas de INDEX_METRICS."""
+    check = check_total_venta(data, tolerance, rel_tolerance)
+    days = parse_dates(data['fecha_venta'])[0].to_numpy(dtype='datetime64[D]')
+    deviation = np.where(check['estado'] == STATUS_INCOMPLETE, 0.0, check['desviacion'])
+    return pd.DataFrame({
+        'id_producto': pd.to_numeric(data['id_producto'], errors='coerce').fillna(MISSING_KEYS['id_producto'])
+                       .astype('int64').to_numpy(),
+        'region': data['region'].astype(object).where(data['region'].notna(), MISSING_KEYS['region']).to_numpy(),
+        'dia': np.where(np.isnat(days), MISSING_KEYS['dia'], days.astype(str)),
+        'filas': 1,
+        'inconsistentes': (check['estado'] == STATUS_INCONSISTENT).astype(int).to_numpy(),
+        'incompletas': (check['estado'] == STATUS_INCOMPLETE).astype(int).to_numpy(),
+        'desviacion': deviation,
+        'desviacion_absoluta': np.abs(deviation),
+    }, index=data.index)
+
+def update_index(data, state_path, tolerance=DEFAULT_TOLERANCE, rel_tolerance=0.0):
+    """Actualiza el índice guardado en `state_path` con las filas nuevas y quitadas desde la última vez.
+
+    Las filas se reconocen por su huella (incremental.row_fingerprints): sólo las huellas nuevas se
+    revisan, y el índice recibe la diferencia de aportes de las filas que entran y salen, sin volver
+    a agrupar todo el archivo. Si cambia la tolerancia, o falta o no corresponde algún fragmento de
+    filas, el índice se reconstruye. Devuelve (índice, filas revisadas); el índice tiene una fila por
+    (id_producto, region, dia).
+    """
+    signature = _signature(tolerance, rel_tolerance)
+    state = load_state_file(state_path, signature)
+    rows = None if state is None else _load_rows(state_path, signature, state["generations"])
+    rebuild = rows is None
+    if rebuild:
+        rows, index, generations = _empty_rows(), _empty_index(), [None] * ROW_SHARDS
+    else:
+        index, generations = state["index"], list(state["generations"])
+
+    fingerprints = pd.DataFrame(row_fingerprints(data), columns=['h0', 'h1'])
+    counts = fingerprints.value_counts()
+    fresh = ~pd.MultiIndex.from_frame(fingerprints).isin(rows.index)
+    first = ~fingerprints.duplicated().to_numpy()
+    new_rows = row_contributions(data[fresh & first], tolerance, rel_tolerance)
+    new_rows.index = pd.MultiIndex.from_frame(fingerprints[fresh & first])
+    rows = pd.concat([rows, new_rows]) if len(rows) else new_rows
+
+    # Cuántas veces más (o menos) aparece cada fila respecto a la última actualización
+    previous = rows['veces'] if 'veces' in rows else pd.Series(0, index=rows.index)
+    delta = counts.reindex(rows.index, fill_value=0) - previous.fillna(0).astype(int)
+    changed = (delta != 0).to_numpy()
+    if changed.any():
+        weighted = rows.loc[changed, INDEX_METRICS].astype(float).mul(delta[changed], axis=0)
+        weighted[INDEX_KEYS] = rows.loc[changed, INDEX_KEYS]
+        grouped = weighted.groupby(INDEX_KEYS).sum()
+        index = grouped if index.empty else index.add(grouped, fill_value=0)
+        index = index[index['filas'] > 0].astype({'filas': 'int64', 'inconsistentes': 'int64',
+                                                  'incompletas': 'int64'}).sort_index()
+
+    rows['veces'] = counts.reindex(rows.index, fill_value=0)
+    shards = rows.index.get_level_values('h0').to_numpy(dtype=np.uint64) % ROW_SHARDS
+    present = (rows['veces'] > 0).to_numpy()
+    for shard in (range(ROW_SHARDS) if rebuild else np.unique(shards[changed])):
+        # Una marca nueva por escritura: si el proceso se interrumpe antes de guardar el índice, el
+        # fragmento ya no coincide con él y la próxima vez se reconstruye todo
+        generations[shard] = os.urandom(8).hex()
+        save_state_file(_shard_path(state_path, shard), signature, generation=generations[shard],
+                        rows=rows[present & (shards == shard)])
+    save_state_file(state_path, signature, index=index, generations=generations)
+    return index, int(len(new_rows))
+
+def load_index(state_path, tolerance=DEFAULT_TOLERANCE, rel_tolerance=0.0):
+    """Índice guardado por update_index con esa tolerancia, o None; no lee las filas ni el archivo de ventas."""
+    state = load_state_file(state_path, _signature(tolerance, rel_tolerance))
+    return None if state is None else state["index"]
+
+def _signature(tolerance, rel_tolerance):
+    return repr((tolerance, rel_tolerance, ROW_SHARDS))
+
+def _shard_path(state_path, shard):
+    return f"{os.path.splitext(state_path)[0]}.filas-{shard:02d}.pkl"
+
+def _load_rows(state_path, signature, generations):
+    """Filas de todos los fragmentos, o None si alguno falta o no es el que registró el índice."""
+    shards = []
+    for shard, generation in enumerate(generations):
+        saved = load_state_file(_shard_path(state_path, shard), signature)
+        if saved is None or saved["generation"] != generation:
+            return None
+        shards.append(saved["rows"])
+    return pd.concat(shards)
+
+def _empty_rows():
+    return pd.DataFrame(columns=INDEX_KEYS + INDEX_METRICS + ['veces'],
+                        index=pd.MultiIndex.from_arrays([[], []], names=['h0', 'h1']))
+
+def _empty_index():
+    return pd.DataFrame(columns=INDEX_METRICS, index=pd.MultiIndex.from_arrays([[], [], []], names=INDEX_KEYS),
+                        dtype=float)
+
+### Consultas sobre el índice
+
+def query_index(index, id_producto=None, region=None, start=None, end=None):
+    """Filas del índice de un producto, una región y/o un rango de días (AAAA-MM-DD, inclusive).
+
+    Con un rango de días se excluyen las filas sin fecha, que no pertenecen a ningún rango.
+    """
+    result = index
+    if id_producto is not None:
+        result = result[result.index.get_level_values('id_producto') == id_producto]
+    if region is not None:
+        result = result[result.index.get_level_values('region') == region]
+    if start is not None or end is not None:
+        result = result[result.index.get_level_values('dia') != MISSING_KEYS['dia']]
+    days = result.index.get_level_values('dia')
+    if start is not None:
+        result = result[days >= start]
+        days = result.index.get_level_values('dia')
+    if end is not None:
+        result = result[days <= end]
+    return result
+
+def summarize(index, by='id_producto'):
+    """Totales por `by` (una o varias claves), ordenados de mayor a menor número de inconsistencias."""
+    summary = index.groupby(level=by).sum()
+    summary['desviacion_media'] = summary['desviacion'] / summary['inconsistentes'].where(summary['inconsistentes'] > 0)
+    return summary.sort_values(['inconsistentes', 'desviacion_absoluta'], ascending=False)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Índice de consistencia de total_venta = precio * cantidad_vendida")
+    parser.add_argument("--file", default="O:\\jose-test\\ventas1.xlsx", help="Archivo de ventas")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Diferencia absoluta aceptada")
+    parser.add_argument("--rel-tolerance", type=float, default=0.0,
+                        help="Diferencia relativa aceptada (fracción del total esperado)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Leer siempre el Excel en lugar de la caché columnar")
+    parser.add_argument("--product", type=int, default=None, help="Detalle de un id_producto")
+    parser.add_argument("--region", default=None, help="Detalle de una región")
+    parser.add_argument("--from", dest="start", default=None, help="Primer día (AAAA-MM-DD)")
+    parser.add_argument("--to", dest="end", default=None, help="Último día (AAAA-MM-DD)")
+    parser.add_argument("--by", nargs="+", default=['id_producto'], choices=INDEX_KEYS,
+                        help="Claves del resumen")
+    parser.add_argument("--top", type=int, default=10, help="Filas del resumen que se muestran")
+    parser.add_argument("--query-only", action="store_true",
+                        help="Consultar el índice guardado sin leer el archivo de ventas")
+    args = parser.parse_args()
+
+    state_path = cache_file(args.file, ".consistencia.pkl")
+    if args.query_only:
+        index = load_index(state_path, args.tolerance, args.rel_tolerance)
+        if index is None:
+            sys.exit(f"No hay un índice guardado de {args.file} con esa tolerancia; ejecute sin --query-only")
+    else:
+        data = load_sales(args.file, not args.no_cache)
+        normalize_numeric_columns(data)
+        index, evaluated = update_index(data, state_path, args.tolerance, args.rel_tolerance)
+        print(f"Filas nuevas revisadas: {evaluated} de {len(data)}")
+    selected = query_index(index, args.product, args.region, args.start, args.end)
+    print(f"Inconsistentes: {int(selected['inconsistentes'].sum())}, incompletas: "
+          f"{int(selected['incompletas'].sum())}, filas: {int(selected['filas'].sum())}")
+    print(summarize(selected, args.by).head(args.top).to_string())
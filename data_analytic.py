@@ -1,4 +1,5 @@
-import pandas as pd
+from data_loader import load_sales
+from number_parsing import STATUS_LABELS, normalize_numeric_columns
 
 '''@uthor: José Luis García Quinayás
 City: Popayán - Cauca
@@ -6,29 +7,25 @@ Date: 26/Oct/2024'''
 
 # Cargar el archivo ventas1.xlsx para consultar el contenido y validar los nombres, títulos, encabezados de las columnas
 file_path = r'O:\jose-test\ventas1.xlsx'  # Usar cadena sin formato para evitar caracteres de escape
-df = pd.read_excel(file_path, engine='openpyxl')  # Especificar el motor
+# Separador decimal de los textos numéricos: None lo detecta, 'en' = punto, 'es' = coma
+decimal = None
+df = load_sales(file_path)  # Desde la caché columnar; el Excel sólo se vuelve a leer si cambió
 
 # 1. Identificar el conteo de valores nulos en cada columna
 '''null_counts = df.isnull().sum()
 print("Conteo de valores nulos por columna:")
 print(null_counts)'''
 
-df['precio'] = pd.to_numeric(df['precio'].astype(str).str.replace('$', '').str.replace(',', ''), errors='coerce')
-df['total_venta'] = pd.to_numeric(df['total_venta'].astype(str).str.replace('$', '').str.replace(',', ''), errors='coerce')
+# Convertir 'precio' y 'total_venta' a números, quitando símbolos de moneda y separadores de miles
+parse_status = normalize_numeric_columns(df, ['precio', 'total_venta'], decimal)
+print("Estado de la conversión numérica por columna:")
+print(parse_status.apply(lambda col: col.map(STATUS_LABELS).value_counts()).fillna(0).astype(int))
 
 # Identificar el conteo de valores nulos en cada columna
 null_counts = df.isnull().sum()
 print("Conteo de valores errados por columna:")
 print(null_counts)
 
-# 2. Contar registros con precios negativos
-# Función para limpiar el texto y convertirlo en número
-def parse_price(price):
-    # Eliminar el símbolo de dólar y convertir a número
-    if isinstance(price, str):
-        price = price.replace('$', '').replace(',', '')
-    return pd.to_numeric(price, errors='coerce')
-
 '''
 Valores nulos:
 
@@ -0,0 +1,245 @@
+import hashlib
+import json
+import os
+import pickle
+import pandas as pd
+from openpyxl import load_workbook
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # sin pyarrow la caché se guarda con pickle
+    pa = None
+    feather = None
+
+'''@uthor: José Luis García Quinayás
+City: Popayán - Cauca
+Date: 18/Oct/2026'''
+
+# Tamaño de bloque por defecto para la lectura en streaming (filas por bloque)
+DEFAULT_CHUNK_SIZE = 50000
+
+# Columnas del archivo de ventas y su descripción
+column_descriptions = {
+    'fecha_venta': 'Fecha de la venta (algunos valores nulos).',
+    'id_producto': 'Identificación del producto (sin valores nulos).',
+    'nombre_producto': 'Nombre del producto (algunos valores nulos).',
+    'categoria': 'Categoría del producto (algunos valores nulos).',
+    'precio': 'Precio del producto, con algunos datos negativos (algunos valores nulos).',
+    'cantidad_vendida': 'Cantidad de producto vendido (sin valores nulos).',
+    'total_venta': 'Monto total de la venta, en algunos casos inconsistentes con el precio y cantidad.',
+    'nombre_cliente': 'Nombre del cliente (algunos valores nulos).',
+    'region': 'Región de la venta (algunos valores nulos).',
+    'metodo_pago': 'Método de pago usado (algunos valores nulos).'
+}
+
+# Textos que pd.read_excel interpreta como nulos por defecto
+NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+             '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+# Columnas de texto con pocos valores distintos; se guardan como categóricas
+CATEGORICAL_COLUMNS = ['nombre_producto', 'categoria', 'nombre_cliente', 'region', 'metodo_pago']
+
+def to_categorical(data, columns=CATEGORICAL_COLUMNS, max_unique_ratio=0.5):
+    """Convierte a categóricas las columnas de texto de `columns` con pocos valores distintos.
+
+    Cada valor distinto se guarda una sola vez y las filas sólo guardan su código, así que las
+    reglas de texto se evalúan una vez por valor distinto. Una columna se deja como está si sus
+    valores distintos superan `max_unique_ratio` de las filas. Modifica y devuelve `data`.
+    """
+    for column in columns:
+        if column not in data.columns or isinstance(data[column].dtype, pd.CategoricalDtype):
+            continue
+        if pd.api.types.is_numeric_dtype(data[column]):
+            continue
+        if data[column].nunique() <= max_unique_ratio * len(data):
+            data[column] = data[column].astype('category')
+    return data
+
+# Lectura del archivo de ventas por bloques
+def iter_excel_chunks(file_path, chunk_size=DEFAULT_CHUNK_SIZE, sheet_name=None):
+    """Recorre la hoja de Excel en bloques de `chunk_size` filas sin cargar el libro completo.
+
+    Usa openpyxl en modo read-only, así que la memoria depende del tamaño del bloque y no
+    del archivo. Cada bloque es un DataFrame con los encabezados de la primera fila y un
+    índice que conserva la posición de la fila en la hoja (0 = primera fila de datos). Las filas
+    vacías del final de la hoja (celdas con formato pero sin valor) se descartan, igual que en
+    pd.read_excel.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size debe ser mayor que cero")
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(col) for col in header]
+        block = []
+        # Filas vacías pendientes: sólo se agregan si después aparece una fila con datos
+        blank = []
+        start = 0
+        for row in rows:
+            if all(value is None for value in row):
+                blank.append(row)
+                continue
+            block.extend(blank)
+            block.append(row)
+            blank = []
+            while len(block) >= chunk_size:
+                yield _build_chunk(block[:chunk_size], columns, start)
+                start += chunk_size
+                block = block[chunk_size:]
+        if block:
+            yield _build_chunk(block, columns, start)
+    finally:
+        wb.close()
+
+def _build_chunk(block, columns, start):
+    """Convierte un bloque de filas de openpyxl en DataFrame, igual que lo haría pd.read_excel."""
+    chunk = pd.DataFrame(block, columns=columns, index=pd.RangeIndex(start, start + len(block)))
+    # pd.read_excel trata las celdas con textos como 'NA' o vacíos como nulas
+    return to_categorical(chunk.mask(chunk.isin(NA_VALUES)))
+
+### Caché columnar del archivo de ventas
+
+# Carpeta de la caché dentro del directorio local del usuario (no junto al origen, que suele
+# estar en una unidad compartida: la caché con pickle y los estados incrementales se cargan con
+# pickle y un archivo ajeno ejecutaría código al leerlos). VENTAS_CACHE_DIR la reemplaza.
+CACHE_DIR_NAME = "ventas_cache"
+
+def default_cache_dir():
+    """Carpeta de la caché por defecto: VENTAS_CACHE_DIR o la carpeta de caché local del usuario."""
+    if os.environ.get("VENTAS_CACHE_DIR"):
+        return os.environ["VENTAS_CACHE_DIR"]
+    root = (os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+            or os.path.join(os.path.expanduser("~"), ".cache"))
+    return os.path.join(root, CACHE_DIR_NAME)
+
+def _make_cache_dir(path):
+    """Crea la carpeta de `path` sólo con permisos para el usuario actual."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), mode=0o700, exist_ok=True)
+
+def source_signature(file_path):
+    """Ruta absoluta, tamaño y fecha de modificación del archivo de origen."""
+    stat = os.stat(file_path)
+    return {"path": os.path.abspath(file_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+def file_digest(file_path):
+    """Hash SHA-256 del contenido del archivo, leído por bloques."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def cache_file(file_path, extension, cache_dir=None):
+    """Ruta en la caché de un archivo derivado del origen (datos, metadatos, estado incremental...)."""
+    source = os.path.abspath(file_path)
+    cache_dir = cache_dir or default_cache_dir()
+    name = os.path.splitext(os.path.basename(source))[0]
+    key = hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{name}-{key}{extension}")
+
+def load_sales(file_path, use_cache=True, cache_dir=None):
+    """Carga el archivo de ventas, convirtiéndolo a una caché columnar la primera vez.
+
+    La caché se identifica por la ruta, el tamaño, la fecha de modificación y el hash del
+    contenido del origen. Si ruta, tamaño y fecha coinciden se usa sin más; si cambiaron pero el
+    hash es el mismo (archivo copiado o tocado) se reutiliza y se actualiza su firma. En otro caso
+    se vuelve a leer el Excel. Los datos se guardan en Arrow IPC sin compresión y se abren con
+    memory-map; si pyarrow no está instalado o alguna columna mezcla tipos (números y textos en la
+    misma columna) se guardan con pickle. Las columnas de CATEGORICAL_COLUMNS se devuelven como
+    categóricas (en Arrow quedan codificadas con diccionario). La caché vive en la carpeta local
+    del usuario (default_cache_dir), no junto al origen.
+    """
+    if not use_cache:
+        return to_categorical(pd.read_excel(file_path, engine='openpyxl'))
+
+    meta_path = cache_file(file_path, ".json", cache_dir)
+    signature = source_signature(file_path)
+    meta = _read_cache_meta(meta_path)
+    digest = None
+    if meta is not None and os.path.exists(meta.get("data_path", "")):
+        if all(meta.get(field) == value for field, value in signature.items()):
+            return _read_cache(meta)
+        digest = file_digest(file_path)
+        if meta.get("sha256") == digest:
+            _write_cache_meta(meta_path, dict(meta, **signature))
+            return _read_cache(meta)
+
+    digest = digest or file_digest(file_path)
+    data = to_categorical(pd.read_excel(file_path, engine='openpyxl'))
+    try:
+        cache_format, data_path = _write_cache(data, file_path, cache_dir)
+        _write_cache_meta(meta_path, dict(signature, sha256=digest, format=cache_format, data_path=data_path))
+    except OSError as e:
+        print(f"No se pudo guardar la caché de {file_path}: {e}")
+    return data
+
+def _read_cache(meta):
+    if meta.get("format") == "arrow":
+        data = feather.read_table(meta["data_path"], memory_map=True).to_pandas()
+    else:
+        data = pd.read_pickle(meta["data_path"])
+    # Las cachés anteriores a las columnas categóricas se convierten al leerlas
+    return to_categorical(data)
+
+def _write_cache(data, file_path, cache_dir):
+    """Guarda los datos en Arrow IPC o, si no es posible, con pickle; devuelve (formato, ruta)."""
+    if feather is not None:
+        try:
+            return "arrow", _replace_atomically(cache_file(file_path, ".arrow", cache_dir),
+                                                lambda tmp_path: feather.write_feather(data, tmp_path,
+                                                                                       compression='uncompressed'))
+        except (pa.ArrowException, TypeError, ValueError):
+            pass
+    return "pickle", _replace_atomically(cache_file(file_path, ".pkl", cache_dir),
+                                         lambda tmp_path: data.to_pickle(tmp_path))
+
+def _replace_atomically(path, write):
+    """Escribe a un temporal y lo renombra, para no dejar nunca una caché a medias."""
+    _make_cache_dir(path)
+    tmp_path = path + ".tmp"
+    try:
+        write(tmp_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+    return path
+
+### Estados guardados en la caché (modo incremental, índice de consistencia)
+
+def load_state_file(path, signature):
+    """Estado guardado con save_state_file, o None si no existe, está dañado o tiene otra firma."""
+    try:
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    if not isinstance(state, dict) or state.get("signature") != signature:
+        return None
+    return state
+
+def save_state_file(path, signature, **values):
+    """Guarda `values` junto con `signature` en `path`, reemplazando el archivo sólo cuando está completo."""
+    def write(tmp_path):
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(dict(values, signature=signature), f, protocol=pickle.HIGHEST_PROTOCOL)
+    return _replace_atomically(path, write)
+
+def _read_cache_meta(meta_path):
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_cache_meta(meta_path, meta):
+    tmp_path = meta_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
@@ -0,0 +1,86 @@
+import datetime
+import functools
+import re
+import numpy as np
+import pandas as pd
+
+'''@uthor: José Luis García Quinayás
+City: Popayán - Cauca
+Date: 18/Oct/2026'''
+
+# Formato esperado de las fechas escritas como texto (AAAA-MM-DD)
+DATE_FORMAT = '%Y-%m-%d'
+
+# Estado de la conversión de cada fecha
+STATUS_OK = 0             # fecha válida (celda de fecha nativa o texto con el formato esperado)
+STATUS_NULL = 1           # celda vacía o nula
+STATUS_MALFORMED = 2      # texto que no sigue el formato, fecha imposible (p. ej. 2024-02-30) u otro tipo
+STATUS_OUT_OF_RANGE = 3   # fecha válida fuera del rango permitido
+
+# Unidad de las fechas convertidas: microsegundos cubren los años 1 a 9999 de datetime, mientras que
+# los nanosegundos sólo llegan de 1677 a 2262 y numpy desborda sin aviso las fechas fuera de ese rango
+DATETIME_DTYPE = 'datetime64[us]'
+
+# Expresión equivalente a cada directiva de strptime, con el número exacto de dígitos
+_DIRECTIVES = {'%Y': r'\d{4}', '%m': r'\d{2}', '%d': r'\d{2}', '%H': r'\d{2}', '%M': r'\d{2}', '%S': r'\d{2}'}
+
+def parse_dates(series, date_format=DATE_FORMAT, min_date=None, max_date=None):
+    """Convierte una columna de fechas en una sola pasada y devuelve (valores datetime64, estados).
+
+    Las celdas que ya son fechas (datetime de openpyxl, Timestamp o datetime64) se aceptan tal
+    cual; los textos deben seguir `date_format` exactamente. Cada valor distinto se revisa una sola
+    vez y el resultado se expande a las filas con sus códigos, sin convertir cada fila a texto.
+    `min_date` y `max_date` (inclusive) marcan como fuera de rango las fechas válidas que no caben.
+    """
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = pd.Series(series.to_numpy(dtype=DATETIME_DTYPE), index=series.index, name=series.name)
+        null = values.isna().to_numpy()
+        status = np.where(null, STATUS_NULL, STATUS_OK).astype(np.int8)
+    else:
+        codes, uniques = pd.factorize(series)
+        parsed = _parse_unique(pd.Series(np.asarray(uniques, dtype=object), dtype=object), date_format)
+        # Un valor más al final para los nulos, a los que factorize asigna el código -1
+        parsed = np.append(parsed, np.array('NaT', dtype=DATETIME_DTYPE))
+        values = pd.Series(parsed[codes], index=series.index, name=series.name)
+        status = np.full(len(series), STATUS_OK, dtype=np.int8)
+        status[np.isnat(parsed[codes])] = STATUS_MALFORMED
+        status[codes < 0] = STATUS_NULL
+
+    status = pd.Series(status, index=series.index, name=series.name)
+    return values, mark_out_of_range(values, status, min_date, max_date)
+
+def mark_out_of_range(values, status, min_date=None, max_date=None):
+    """Copia de `status` con las fechas válidas fuera de [min_date, max_date] como STATUS_OUT_OF_RANGE.
+
+    Permite revisar varios rangos sobre una misma conversión de parse_dates sin repetirla.
+    """
+    status = status.copy()
+    valid = (status == STATUS_OK).to_numpy()
+    if min_date is not None:
+        status[valid & (values < pd.Timestamp(min_date)).to_numpy()] = STATUS_OUT_OF_RANGE
+    if max_date is not None:
+        status[valid & (values > pd.Timestamp(max_date)).to_numpy()] = STATUS_OUT_OF_RANGE
+    return status
+
+def _parse_unique(uniques, date_format):
+    """Fecha de cada valor distinto (NaT si no es válido), como arreglo DATETIME_DTYPE."""
+    parsed = np.full(len(uniques), np.datetime64('NaT', 'us'))
+    is_text = uniques.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    text = uniques[is_text]
+    strict = text.str.fullmatch(_format_regex(date_format)).to_numpy(dtype=bool)
+    positions = np.flatnonzero(is_text)[strict]
+    if len(positions):
+        parsed[positions] = pd.to_datetime(text[strict], format=date_format, errors='coerce').to_numpy(
+            dtype=DATETIME_DTYPE)
+    native = uniques.map(lambda value: isinstance(value, (datetime.date, np.datetime64))).to_numpy(dtype=bool)
+    if native.any():
+        # numpy convierte cada fecha directamente a microsegundos, sin pasar por nanosegundos
+        parsed[native] = np.array(list(uniques[native]), dtype=DATETIME_DTYPE)
+    return parsed
+
+@functools.lru_cache(maxsize=None)
+def _format_regex(date_format):
+    """Expresión regular que exige el formato exacto (strptime acepta, p. ej., meses de un dígito)."""
+    parts = re.split(r'(%[A-Za-z])', date_format)
+    # Las directivas sin ancho fijo (%b, %B, ...) aceptan cualquier texto y las valida strptime
+    return ''.join(_DIRECTIVES.get(part, '.+?') if part.startswith('%') else re.escape(part) for part in parts)
@@ -1,81 +1,131 @@
+import argparse
+import os
+import numpy as np
 import pandas as pd
 import re
+from concurrent.futures import ProcessPoolExecutor
+
+from consistency import DEFAULT_TOLERANCE, STATUS_INCONSISTENT, check_total_venta
+from data_loader import cache_file, load_sales
+from incremental import evaluate_incremental
+from number_parsing import DECIMAL_SEPARATORS, normalize_numeric_columns
+from profiling import instrument, print_metrics, save_metrics_sheet
+from report_writer import REPORT_FORMATS, write_consolidated, write_report_frame
 
 '''@uthor: José Luis García Quinayás
 City: Popayán - Cauca
 Date: 27/Oct/2024'''
 
-# ubicación del archivo ventas
+# ubicación del archivo ventas y carpeta de los reportes
 file_path = "O:\\jose-test\\ventas1.xlsx"
+output_dir = "O:\\jose-test"
+# Formato de los reportes: 'xlsx', 'csv' o 'parquet'
+report_format = "xlsx"
+# Separador decimal de los textos numéricos: None lo detecta, 'en' = punto, 'es' = coma
+decimal = None
+# Tolerancia de total_venta frente a precio * cantidad_vendida: absoluta y relativa al total esperado
+tolerance = DEFAULT_TOLERANCE
+rel_tolerance = 0.0
+
+# Reporte de casos de prueba donde se agrega la hoja de instrumentación
+test_report_path = "O:\\test_qa_engineer\\test_report.xlsx"
 
 # Cargar el archivo Excel
-data = pd.read_excel(file_path)
+def load_data(path=file_path, use_cache=True):
+    data = load_sales(path, use_cache)
+    # Convertir 'precio', 'cantidad_vendida' y 'total_venta' a números (acepta "$1,200", "(45.10)", ...)
+    normalize_numeric_columns(data, decimal=decimal)
+    return data
 
-# Convertir las columnas 'precio' y 'cantidad_vendida' a números
-data['precio'] = pd.to_numeric(data['precio'], errors='coerce')
-data['cantidad_vendida'] = pd.to_numeric(data['cantidad_vendida'], errors='coerce')
+# Ruta completa de un archivo de reporte, con la extensión del formato elegido
+def report_file(file_name):
+    return os.path.join(output_dir, os.path.splitext(file_name)[0] + "." + report_format)
 
 # Caracteres especiales
 special_characters_pattern = r'[^a-zA-Z0-9\s]'
 
+# máscaras de filas de cada reporte
+
+def missing_fields_mask(data, column_name):
+    return data[column_name].isna() | (data[column_name] == '')
+
+def negative_precio_mask(data):
+    return data['precio'] < 0
+
+def negative_cantidad_vendida_mask(data):
+    return data['cantidad_vendida'] < 0
+
+# Diferencias dentro de la tolerancia (redondeo) no cuentan; las filas sin precio, cantidad o total
+# tampoco (ya aparecen como nulos en el caso 04)
+def inconsistent_total_venta_mask(data):
+    return check_total_venta(data, tolerance, rel_tolerance)['estado'] == STATUS_INCONSISTENT
+
+def special_characters_mask(data, column_name):
+    return data[column_name].str.contains(special_characters_pattern, regex=True, na=False)
+
+def invalid_categoria_mask(data):
+    return ~special_characters_mask(data, 'categoria') | data['categoria'].isna() | (data['categoria'] == '')
+
+def not_valid_categoria_mask(data, valid_categories):
+    return ~data['categoria'].isin(valid_categories)
+
 # funciones de los reportes
 
 # 1. Reporte de campos nulos o vacíos en columnas específicas
 def report_missing_fields(data, column_name):
     """Genera reporte para registros con valores nulos o vacíos en una columna específica."""
-    missing_data = data[data[column_name].isna() | (data[column_name] == '')]
-    missing_data.to_excel(f"O:\\jose-test\\reporte_missing_{column_name}.xlsx", index=False)
+    missing_data = data[missing_fields_mask(data, column_name)]
+    write_report_frame(missing_data, report_file(f"reporte_missing_{column_name}.xlsx"))
     print(f"Reporte generado: Registros con {column_name} vacío o nulo - {missing_data.shape[0]} registros")
     return missing_data.shape[0]
 
 # 2. Reporte de precios negativos
 def report_negative_precio(data):
     """Genera reporte para precios negativos en la columna 'precio'."""
-    negative_precio = data[data['precio'] < 0]
-    negative_precio.to_excel("O:\\jose-test\\reporte_negative_precio.xlsx", index=False)
+    negative_precio = data[negative_precio_mask(data)]
+    write_report_frame(negative_precio, report_file("reporte_negative_precio.xlsx"))
     print(f"Reporte generado: Registros con precios negativos - {negative_precio.shape[0]} registros")
     return negative_precio.shape[0]
 
 # 3. Reporte de cantidades negativas en 'cantidad_vendida'
 def report_negative_cantidad_vendida(data):
     """Genera reporte para registros con cantidad_vendida negativa."""
-    negative_cantidad = data[data['cantidad_vendida'] < 0]
-    negative_cantidad.to_excel("O:\\jose-test\\reporte_negative_cantidad_vendida.xlsx", index=False)
+    negative_cantidad = data[negative_cantidad_vendida_mask(data)]
+    write_report_frame(negative_cantidad, report_file("reporte_negative_cantidad_vendida.xlsx"))
     print(f"Reporte generado: Registros con cantidad_vendida negativa - {negative_cantidad.shape[0]} registros")
     return negative_cantidad.shape[0]
 
 # 4. Reporte de total_venta inconsistente
 def report_inconsistent_total_venta(data):
     """Verifica que total_venta coincida con precio * cantidad_vendida y guarda un reporte en Excel."""
-    inconsistent_total = data[data['total_venta'] != data['precio'] * data['cantidad_vendida']]
-    inconsistent_total.to_excel("O:\\jose-test\\reporte_inconsistent_total_venta.xlsx", index=False)
+    inconsistent_total = data[inconsistent_total_venta_mask(data)]
+    write_report_frame(inconsistent_total, report_file("reporte_inconsistent_total_venta.xlsx"))
     print(f"Reporte generado: Registros con total_venta inconsistente - {inconsistent_total.shape[0]} registros")
     return inconsistent_total.shape[0]
 
 # 5. Reporte de caracteres especiales en columnas específicas (incluye guion)
 def report_special_characters(data, column_name):
     """Genera reporte para registros con y sin caracteres especiales en una columna de texto."""
-    special_chars = data[column_name].str.contains(special_characters_pattern, regex=True, na=False)
+    special_chars = special_characters_mask(data, column_name)
     with_special = data[special_chars]
     without_special = data[~special_chars]
-    with_special.to_excel(f"O:\\jose-test\\reporte_{column_name}_con_especiales.xlsx", index=False)
-    without_special.to_excel(f"O:\\jose-test\\reporte_{column_name}_sin_especiales.xlsx", index=False)
+    write_report_frame(with_special, report_file(f"reporte_{column_name}_con_especiales.xlsx"))
+    write_report_frame(without_special, report_file(f"reporte_{column_name}_sin_especiales.xlsx"))
     print(f"Reporte generado: {column_name} - {with_special.shape[0]} con caracteres especiales, {without_special.shape[0]} sin caracteres especiales")
     return with_special.shape[0], without_special.shape[0]
 
 # 6. Reporte de valores válidos en 'categoria'
 def report_invalid_categoria(data):
     """Genera reporte para registros en la columna 'categoria' con valores no especiales, vacíos o nulos."""
-    special_characters = data['categoria'].str.contains(special_characters_pattern, regex=True, na=False)
-    invalid_categoria = data[~special_characters | data['categoria'].isna() | (data['categoria'] == '')]
-    invalid_categoria.to_excel("O:\\jose-test\\reporte_categoria_invalidos.xlsx", index=False)
+    invalid_categoria = data[invalid_categoria_mask(data)]
+    write_report_frame(invalid_categoria, report_file("reporte_categoria_invalidos.xlsx"))
     print(f"Reporte generado: Categoría no especial, vacía o nula - {invalid_categoria.shape[0]} registros")
     return invalid_categoria.shape[0]
 
 def report_valid_categoria(data, valid_categories):
     """Verifica que las categorías pertenezcan a una lista válida y guarda un reporte en Excel."""
-    invalid_categoria = data[~data['categoria'].isin(valid_categories)]
-    invalid_categoria.to_excel("O:\\jose-test\\reporte_categoria_no_valida.xlsx", index=False)
+    invalid_categoria = data[not_valid_categoria_mask(data, valid_categories)]
+    write_report_frame(invalid_categoria, report_file("reporte_categoria_no_valida.xlsx"))
     print(f"Reporte generado: Categorías no válidas - {invalid_categoria.shape[0]} registros")
     return invalid_categoria.shape[0]
 
@@ -84,45 +134,262 @@ valid_categories = ['Electrónica', 'Ropa', 'Alimentos']
 
 def report_special_characters_metodo_pago(data):
     """Genera reporte para registros con y sin caracteres especiales en la columna 'metodo_pago'."""
-    special_chars = data['metodo_pago'].str.contains(special_characters_pattern, regex=True, na=False)
+    special_chars = special_characters_mask(data, 'metodo_pago')
     with_special = data[special_chars]
     without_special = data[~special_chars]
-    with_special.to_excel("O:\\jose-test\\reporte_metodo_pago_con_especiales.xlsx", index=False)
-    without_special.to_excel("O:\\jose-test\\reporte_metodo_pago_sin_especiales.xlsx", index=False)
+    write_report_frame(with_special, report_file("reporte_metodo_pago_con_especiales.xlsx"))
+    write_report_frame(without_special, report_file("reporte_metodo_pago_sin_especiales.xlsx"))
     print(f"Reporte generado: método de pago - {with_special.shape[0]} con caracteres especiales, {without_special.shape[0]} sin caracteres especiales")
     return with_special.shape[0], without_special.shape[0]
 
-# Ejecutar los reportes y almacenar los conteos
-missing_fecha_venta = report_missing_fields(data, 'fecha_venta')
-missing_id_producto = report_missing_fields(data, 'id_producto')
-missing_nombre_producto = report_missing_fields(data, 'nombre_producto')
-missing_categoria = report_missing_fields(data, 'categoria')
-negative_precio = report_negative_precio(data)
-negative_cantidad_vendida = report_negative_cantidad_vendida(data)
-inconsistent_total_venta = report_inconsistent_total_venta(data)
-nombre_producto_con, nombre_producto_sin = report_special_characters(data, 'nombre_producto')
-nombre_cliente_con, nombre_cliente_sin = report_special_characters(data, 'nombre_cliente')
-invalid_categoria = report_valid_categoria(data, valid_categories)
-invalid_categoria_report = report_invalid_categoria(data)
-metodo_pago_con, metodo_pago_sin = report_special_characters_metodo_pago(data)
-
-# Resumen de criterios de cada reporte:
-criterios_reporte = {
-    "fecha_venta vacío o nulo": missing_fecha_venta,
-    "id_producto vacío o nulo": missing_id_producto,
-    "nombre_producto vacío o nulo": missing_nombre_producto,
-    "categoria vacío o nulo": missing_categoria,
-    "precio negativo": negative_precio,
-    "cantidad_vendida negativa": negative_cantidad_vendida,
-    "total_venta inconsistente": inconsistent_total_venta,
-    "nombre_producto con caracteres especiales": nombre_producto_con,
-    "nombre_producto sin caracteres especiales": nombre_producto_sin,
-    "nombre_cliente con caracteres especiales": nombre_cliente_con,
-    "nombre_cliente sin caracteres especiales": nombre_cliente_sin,
-    "categorías no válidas": invalid_categoria,
-    "categoría no especial, vacía o nula": invalid_categoria_report,
-    "metodo_pago con caracteres especiales": metodo_pago_con,
-    "metodo_pago sin caracteres especiales": metodo_pago_sin
+# Ejecutar los reportes uno tras otro y almacenar los conteos
+def run_reports(data):
+    missing_fecha_venta = report_missing_fields(data, 'fecha_venta')
+    missing_id_producto = report_missing_fields(data, 'id_producto')
+    missing_nombre_producto = report_missing_fields(data, 'nombre_producto')
+    missing_categoria = report_missing_fields(data, 'categoria')
+    negative_precio = report_negative_precio(data)
+    negative_cantidad_vendida = report_negative_cantidad_vendida(data)
+    inconsistent_total_venta = report_inconsistent_total_venta(data)
+    nombre_producto_con, nombre_producto_sin = report_special_characters(data, 'nombre_producto')
+    nombre_cliente_con, nombre_cliente_sin = report_special_characters(data, 'nombre_cliente')
+    invalid_categoria = report_valid_categoria(data, valid_categories)
+    invalid_categoria_report = report_invalid_categoria(data)
+    metodo_pago_con, metodo_pago_sin = report_special_characters_metodo_pago(data)
+
+    # Resumen de criterios de cada reporte:
+    criterios_reporte = {
+        "fecha_venta vacío o nulo": missing_fecha_venta,
+        "id_producto vacío o nulo": missing_id_producto,
+        "nombre_producto vacío o nulo": missing_nombre_producto,
+        "categoria vacío o nulo": missing_categoria,
+        "precio negativo": negative_precio,
+        "cantidad_vendida negativa": negative_cantidad_vendida,
+        "total_venta inconsistente": inconsistent_total_venta,
+        "nombre_producto con caracteres especiales": nombre_producto_con,
+        "nombre_producto sin caracteres especiales": nombre_producto_sin,
+        "nombre_cliente con caracteres especiales": nombre_cliente_con,
+        "nombre_cliente sin caracteres especiales": nombre_cliente_sin,
+        "categorías no válidas": invalid_categoria,
+        "categoría no especial, vacía o nula": invalid_categoria_report,
+        "metodo_pago con caracteres especiales": metodo_pago_con,
+        "metodo_pago sin caracteres especiales": metodo_pago_sin
+    }
+    return criterios_reporte
+
+# Criterio del resumen y archivo de salida de cada reporte
+REPORT_FILES = {
+    "fecha_venta vacío o nulo": "reporte_missing_fecha_venta.xlsx",
+    "id_producto vacío o nulo": "reporte_missing_id_producto.xlsx",
+    "nombre_producto vacío o nulo": "reporte_missing_nombre_producto.xlsx",
+    "categoria vacío o nulo": "reporte_missing_categoria.xlsx",
+    "precio negativo": "reporte_negative_precio.xlsx",
+    "cantidad_vendida negativa": "reporte_negative_cantidad_vendida.xlsx",
+    "total_venta inconsistente": "reporte_inconsistent_total_venta.xlsx",
+    "nombre_producto con caracteres especiales": "reporte_nombre_producto_con_especiales.xlsx",
+    "nombre_producto sin caracteres especiales": "reporte_nombre_producto_sin_especiales.xlsx",
+    "nombre_cliente con caracteres especiales": "reporte_nombre_cliente_con_especiales.xlsx",
+    "nombre_cliente sin caracteres especiales": "reporte_nombre_cliente_sin_especiales.xlsx",
+    "categorías no válidas": "reporte_categoria_no_valida.xlsx",
+    "categoría no especial, vacía o nula": "reporte_categoria_invalidos.xlsx",
+    "metodo_pago con caracteres especiales": "reporte_metodo_pago_con_especiales.xlsx",
+    "metodo_pago sin caracteres especiales": "reporte_metodo_pago_sin_especiales.xlsx",
 }
 
-print("Criterios y conteos de cada reporte:", criterios_reporte)
\ No newline at end of file
+# Identifica las reglas de los reportes en el estado del modo incremental (incluye la tolerancia elegida)
+def reports_signature():
+    return repr((list(REPORT_FILES), special_characters_pattern, valid_categories, tolerance, rel_tolerance))
+
+# Máscaras de todos los reportes como matriz booleana (filas x criterios)
+def build_report_matrix(data):
+    special = {column_name: special_characters_mask(data, column_name)
+               for column_name in ['nombre_producto', 'nombre_cliente', 'metodo_pago']}
+    masks = {
+        "precio negativo": negative_precio_mask(data),
+        "cantidad_vendida negativa": negative_cantidad_vendida_mask(data),
+        "total_venta inconsistente": inconsistent_total_venta_mask(data),
+        "categorías no válidas": not_valid_categoria_mask(data, valid_categories),
+        "categoría no especial, vacía o nula": invalid_categoria_mask(data),
+    }
+    for column_name in ['fecha_venta', 'id_producto', 'nombre_producto', 'categoria']:
+        masks[f"{column_name} vacío o nulo"] = missing_fields_mask(data, column_name)
+    for column_name, special_chars in special.items():
+        masks[f"{column_name} con caracteres especiales"] = special_chars
+        masks[f"{column_name} sin caracteres especiales"] = ~special_chars
+    return pd.DataFrame({label: masks[label].to_numpy(dtype=bool) for label in REPORT_FILES}, index=data.index)
+
+# Datos que recibe cada proceso una sola vez al iniciar (con fork se heredan sin copiarse)
+_shared_data = None
+
+def _init_worker(data):
+    global _shared_data
+    _shared_data = data
+
+def _write_report(path, indices):
+    write_report_frame(_shared_data.iloc[indices], path)
+    return path, len(indices)
+
+# Escribir los reportes a partir de la matriz de máscaras
+def write_reports(data, matrix, workers=None):
+    """Escribe un reporte por criterio con las filas marcadas en `matrix`.
+
+    Con `workers` la escritura se reparte entre procesos: cada tarea sólo envía la ruta y las
+    posiciones de sus filas, y los datos llegan a cada proceso una única vez a través del
+    inicializador del pool (0 = un proceso por núcleo).
+    """
+    tasks = [(label, report_file(REPORT_FILES[label]), np.flatnonzero(matrix[label].to_numpy()))
+             for label in matrix.columns]
+    if workers is None:
+        for _, path, indices in tasks:
+            print(f"Reporte generado: {path} - {_write_report_rows(data, path, indices)} registros")
+    else:
+        # Los reportes más grandes primero, para repartir mejor la carga entre procesos
+        pending = sorted(tasks, key=lambda task: len(task[2]), reverse=True)
+        with ProcessPoolExecutor(max_workers=workers or None, initializer=_init_worker, initargs=(data,)) as pool:
+            futures = [pool.submit(_write_report, path, indices) for _, path, indices in pending]
+            for future in futures:
+                path, rows = future.result()
+                print(f"Reporte generado: {path} - {rows} registros")
+
+    criterios_reporte = {label: len(indices) for label, _, indices in tasks}
+    return criterios_reporte
+
+def _write_report_rows(data, path, indices):
+    write_report_frame(data.iloc[indices], path)
+    return len(indices)
+
+### Reporte consolidado
+
+# Archivo único con todos los datos y una columna de marca por criterio
+CONSOLIDATED_FILE = "reporte_consolidado.xlsx"
+
+# Columna de marca de cada criterio: el nombre de su reporte sin "reporte_" (p. ej. "negative_precio")
+FLAG_COLUMNS = {label: os.path.splitext(file_name)[0].replace("reporte_", "", 1)
+                for label, file_name in REPORT_FILES.items()}
+
+def write_consolidated_report(data, matrix):
+    """Escribe los datos una sola vez con una columna booleana por criterio en lugar de un archivo por reporte.
+
+    Cada reporte individual equivale a filtrar su columna en True; en Excel se agrega además la
+    hoja "Resumen" con el criterio, la columna, el número de registros y el archivo que reemplaza.
+    """
+    counts = matrix.sum()
+    summary = [[label, FLAG_COLUMNS[label], int(counts[label]), REPORT_FILES[label]] for label in matrix.columns]
+    path = write_consolidated(data, matrix.rename(columns=FLAG_COLUMNS), report_file(CONSOLIDATED_FILE), summary)
+    print(f"Reporte consolidado generado: {path} - {len(data)} registros, {len(matrix.columns)} criterios")
+
+    criterios_reporte = {label: int(counts[label]) for label in matrix.columns}
+    return criterios_reporte
+
+# Escribir un único archivo consolidado en lugar de los reportes separados
+def run_reports_consolidated(data):
+    return write_consolidated_report(data, build_report_matrix(data))
+
+# Ejecutar los reportes calculando primero todas las máscaras y escribiendo los archivos en paralelo
+def run_reports_parallel(data, workers=0):
+    return write_reports(data, build_report_matrix(data), workers)
+
+# Modo incremental: sólo se recalculan las máscaras de las filas nuevas o modificadas
+def run_reports_incremental(data, state_path, workers=None, consolidated=False):
+    matrix, _, evaluated = evaluate_incremental(data, lambda subset: (build_report_matrix(subset), {}),
+                                                state_path, reports_signature())
+    print(f"Filas evaluadas: {evaluated} de {len(data)}")
+    if consolidated:
+        return write_consolidated_report(data, matrix)
+    return write_reports(data, matrix, workers)
+
+# Hoja de test_report.xlsx con la instrumentación de cada reporte
+METRICS_SHEET = "Instrumentación reportes"
+
+# Modo instrumentado: mide la carga, la conversión numérica y cada reporte (filtro + escritura)
+def run_reports_profiled(source, metrics_path=test_report_path, use_cache=True, profile_threshold=None,
+                         profile_dir=".", trace_memory=False):
+    metrics = []
+    options = {"profile_threshold": profile_threshold, "profile_dir": profile_dir, "trace_memory": trace_memory}
+    with instrument(metrics, "Carga", None, **options):
+        data = load_sales(source, use_cache)
+    metrics[-1]["rows"] = len(data)
+    with instrument(metrics, "Conversión numérica", len(data), **options):
+        normalize_numeric_columns(data, decimal=decimal)
+
+    # (fase, función, argumentos, criterios del resumen que devuelve)
+    reports = [(f"report_missing_fields ({column_name})", report_missing_fields, (column_name,),
+                [f"{column_name} vacío o nulo"])
+               for column_name in ['fecha_venta', 'id_producto', 'nombre_producto', 'categoria']]
+    reports += [("report_negative_precio", report_negative_precio, (), ["precio negativo"]),
+                ("report_negative_cantidad_vendida", report_negative_cantidad_vendida, (),
+                 ["cantidad_vendida negativa"]),
+                ("report_inconsistent_total_venta", report_inconsistent_total_venta, (),
+                 ["total_venta inconsistente"])]
+    reports += [(f"report_special_characters ({column_name})", report_special_characters, (column_name,),
+                 [f"{column_name} con caracteres especiales", f"{column_name} sin caracteres especiales"])
+                for column_name in ['nombre_producto', 'nombre_cliente']]
+    reports += [("report_valid_categoria", report_valid_categoria, (valid_categories,), ["categorías no válidas"]),
+                ("report_invalid_categoria", report_invalid_categoria, (),
+                 ["categoría no especial, vacía o nula"]),
+                ("report_special_characters_metodo_pago", report_special_characters_metodo_pago, (),
+                 ["metodo_pago con caracteres especiales", "metodo_pago sin caracteres especiales"])]
+    counts = {}
+    for name, report, args, labels in reports:
+        with instrument(metrics, name, len(data), **options):
+            result = report(data, *args)
+        counts.update(zip(labels, result if isinstance(result, tuple) else (result,)))
+
+    save_metrics_sheet(metrics_path, METRICS_SHEET, metrics)
+    print_metrics(metrics)
+    criterios_reporte = {label: counts[label] for label in REPORT_FILES}
+    return criterios_reporte
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reportes de registros con problemas de calidad en ventas")
+    parser.add_argument("--file", default=file_path, help="Archivo de ventas")
+    parser.add_argument("--output-dir", default=output_dir, help="Carpeta donde se guardan los reportes")
+    parser.add_argument("--format", choices=REPORT_FORMATS, default=report_format,
+                        help="Formato de los reportes (mismos nombres de archivo, cambia la extensión)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Escribir los reportes en paralelo con N procesos (0 = uno por núcleo)")
+    parser.add_argument("--consolidated", action="store_true",
+                        help="Guardar un único reporte_consolidado con una columna de marca por criterio")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Leer siempre el Excel en lugar de la caché columnar")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Recalcular sólo las filas nuevas o modificadas desde la última ejecución")
+    parser.add_argument("--profile", action="store_true",
+                        help="Medir cada reporte y agregar la hoja de instrumentación a test_report.xlsx")
+    parser.add_argument("--test-report", default=test_report_path,
+                        help="Libro donde se agrega la hoja de instrumentación")
+    parser.add_argument("--profile-threshold", type=float, default=None,
+                        help="Con --profile, guardar un perfil cProfile de los reportes que superen N segundos")
+    parser.add_argument("--profile-dir", default=".", help="Carpeta de los perfiles cProfile")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Con --profile, medir la memoria con tracemalloc (más exacto, pero más lento)")
+    parser.add_argument("--tolerance", type=float, default=tolerance,
+                        help="Diferencia absoluta aceptada entre total_venta y precio * cantidad_vendida")
+    parser.add_argument("--rel-tolerance", type=float, default=rel_tolerance,
+                        help="Diferencia relativa aceptada (fracción del total esperado)")
+    parser.add_argument("--decimal", choices=list(DECIMAL_SEPARATORS), default=decimal,
+                        help="Separador decimal de los números escritos como texto (por defecto se detecta)")
+    args = parser.parse_args()
+    output_dir = args.output_dir
+    report_format = args.format
+    tolerance = args.tolerance
+    rel_tolerance = args.rel_tolerance
+    decimal = args.decimal
+
+    if args.profile:
+        criterios_reporte = run_reports_profiled(args.file, args.test_report, not args.no_cache,
+                                                 args.profile_threshold, args.profile_dir,
+                                                 args.trace_memory)
+    else:
+        data = load_data(args.file, not args.no_cache)
+        if args.incremental:
+            criterios_reporte = run_reports_incremental(data, cache_file(args.file, ".reportes.pkl"),
+                                                        args.workers, args.consolidated)
+        elif args.consolidated:
+            criterios_reporte = run_reports_consolidated(data)
+        elif args.workers is None:
+            criterios_reporte = run_reports(data)
+        else:
+            criterios_reporte = run_reports_parallel(data, args.workers)
+
+    print("Criterios y conteos de cada reporte:", criterios_reporte)
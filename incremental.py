@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+from data_loader import load_state_file, save_state_file
+
+'''@uthor: José Luis García Quinayás
+City: Popayán - Cauca
+Date: 18/Oct/2026'''
+
+# Claves de los dos hashes de 64 bits que forman la huella de 128 bits de cada fila
+_HASH_KEYS = ('0123456789123456', 'ventas-huella-02')
+
+# hash_pandas_object sólo usa la clave en los textos; la segunda mitad mezcla además esta sal en el
+# hash de cada columna para que no coincida con la primera en las columnas numéricas o de fecha
+_SALT = np.uint64(0x9E3779B97F4A7C15)
+
+def row_fingerprints(data):
+    """Huella de 128 bits (dos columnas uint64) del contenido de cada fila, sin incluir el índice.
+
+    hash_pandas_object convierte a texto las celdas de las columnas de objetos, así que el tipo de
+    cada celda entra también en la huella: la fecha nativa 2024-01-05 y el texto
+    "2024-01-05 00:00:00" (o 1 y "1") tienen huellas distintas, como distintos son sus resultados.
+    """
+    typed = _with_type_tags(data)
+    first = pd.util.hash_pandas_object(typed, index=False, hash_key=_HASH_KEYS[0]).to_numpy()
+    salted = pd.DataFrame({position: pd.util.hash_pandas_object(typed.iloc[:, position], index=False,
+                                                                hash_key=_HASH_KEYS[1]).to_numpy() ^ _SALT
+                           for position in range(typed.shape[1])}, index=typed.index)
+    second = pd.util.hash_pandas_object(salted, index=False).to_numpy()
+    return np.column_stack([first, second])
+
+def _with_type_tags(data):
+    """`data` con una columna más por cada columna de objetos, con el nombre del tipo de cada celda."""
+    tags = {}
+    for position in range(data.shape[1]):
+        series = data.iloc[:, position]
+        dtype = series.dtype.categories.dtype if isinstance(series.dtype, pd.CategoricalDtype) else series.dtype
+        if dtype != object:
+            continue
+        # El tipo se calcula una vez por valor distinto; factorize no confunde 1 con "1"
+        codes, uniques = pd.factorize(series)
+        names = np.array([type(value).__name__ for value in np.asarray(uniques, dtype=object)] + [''],
+                         dtype=object)
+        tags[f"{series.name} (tipo)"] = names[codes]
+    if not tags:
+        return data
+    return pd.concat([data, pd.DataFrame(tags, index=data.index)], axis=1)
+
+def evaluate_incremental(data, evaluate, state_path, signature):
+    """Evalúa las reglas sólo sobre las filas nuevas o modificadas desde la última ejecución.
+
+    `evaluate(subset)` devuelve (matriz booleana filas x reglas, errores), igual que
+    rules_engine.evaluate. El estado guardado en `state_path` asocia la huella de cada fila con
+    sus resultados; como todas las reglas dependen sólo de su propia fila, las filas con una huella
+    conocida reutilizan esos resultados y la matriz final es idéntica a la de una ejecución completa.
+    `signature` identifica las reglas: si cambia, el estado anterior se descarta.
+
+    Devuelve (matriz, errores, filas evaluadas). Si alguna regla falla se repite la evaluación
+    completa y no se guarda estado, porque los errores dependen de la columna entera.
+    """
+    fingerprints = row_fingerprints(data)
+    state = load_state_file(state_path, signature)
+
+    reused = np.zeros(len(data), dtype=bool)
+    if state is not None:
+        positions = state["index"].get_indexer(fingerprints[:, 0])
+        reused = positions >= 0
+        reused[reused] = state["check"][positions[reused]] == fingerprints[reused, 1]
+
+    pending = ~reused
+    # Sin estado o sin filas no hay nada que reutilizar
+    if pending.all():
+        matrix, errors = evaluate(data)
+    elif not pending.any():
+        matrix = pd.DataFrame(state["results"][positions], index=data.index, columns=state["columns"])
+        errors = {}
+    else:
+        fresh, errors = evaluate(data[pending])
+        if errors:
+            matrix, errors = evaluate(data)
+        else:
+            values = np.empty((len(data), fresh.shape[1]), dtype=bool)
+            values[reused] = state["results"][positions[reused]]
+            values[pending] = fresh.to_numpy(dtype=bool)
+            matrix = pd.DataFrame(values, index=data.index, columns=fresh.columns)
+    if errors:
+        return matrix, errors, len(data)
+
+    save_state(state_path, signature, fingerprints, matrix)
+    return matrix, errors, int(pending.sum())
+
+def save_state(state_path, signature, fingerprints, matrix):
+    """Guarda huellas y resultados de las filas actuales (las filas borradas salen del estado)."""
+    first = ~pd.Index(fingerprints[:, 0]).duplicated()
+    save_state_file(state_path, signature,
+                    columns=list(matrix.columns),
+                    index=pd.Index(fingerprints[first, 0]),
+                    check=fingerprints[first, 1],
+                    results=matrix.to_numpy(dtype=bool)[first])
@@ -0,0 +1,117 @@
+import re
+import numpy as np
+import pandas as pd
+
+'''@uthor: José Luis García Quinayás
+City: Popayán - Cauca
+Date: 18/Oct/2026'''
+
+# Columnas numéricas del archivo de ventas
+NUMERIC_COLUMNS = ['precio', 'cantidad_vendida', 'total_venta']
+
+# Estado de la conversión de cada valor
+STATUS_OK = 0           # ya era un número válido
+STATUS_NORMALIZED = 1   # número válido después de quitar moneda, separadores o paréntesis
+STATUS_NULL = 2         # celda vacía o nula
+STATUS_INVALID = 3      # texto que no se puede interpretar como número
+
+STATUS_LABELS = {
+    STATUS_OK: "válido",
+    STATUS_NORMALIZED: "normalizado",
+    STATUS_NULL: "nulo",
+    STATUS_INVALID: "no numérico",
+}
+
+# Separador decimal por variante regional; None detecta el separador en cada valor
+DECIMAL_SEPARATORS = {'en': '.', 'es': ','}
+
+# Códigos ISO 4217 de moneda aceptados junto al número; otros textos ("SKU 45") no son precios
+CURRENCY_CODES = ['COP', 'USD', 'EUR', 'MXN', 'PEN', 'CLP', 'ARS', 'BRL', 'GBP', 'JPY']
+
+_CURRENCY = r"(?:[$€£¥]|" + "|".join(CURRENCY_CODES) + r")"
+
+# Número con signo, símbolo o código de moneda opcional (antes o después) y negativos contables "(1.234,50)"
+_NUMBER_PATTERN = re.compile(
+    r"^(?P<open>\()?\s*(?P<sign>[-+])?\s*" + _CURRENCY + r"?\s*(?P<inner_sign>[-+])?\s*"
+    r"(?P<digits>\d(?:[\d.,' ]*\d)?)\s*" + _CURRENCY + r"?\s*(?P<close>\))?$"
+)
+
+# Texto con un único punto seguido de exactamente tres dígitos ("1.200", "$1.200"): pd.to_numeric lo
+# leería como decimal, pero en detección automática se toma como separador de miles, igual que "1,200"
+_THOUSANDS_DOT_PATTERN = r"[^.,]*\d\.\d{3}[^.,\d]*"
+
+def parse_numbers(series, decimal=None):
+    """Convierte una columna a números en una sola pasada y devuelve (valores, estados).
+
+    Los valores que pd.to_numeric ya entiende se convierten directamente; sólo los textos que
+    fallan pasan por la limpieza de moneda y separadores, y cada texto distinto se interpreta una
+    única vez. `decimal` fija el separador decimal ('.', ',' o una clave de DECIMAL_SEPARATORS);
+    con None se usa el último separador cuando aparecen ambos, y una coma o un punto solos seguidos
+    de exactamente tres dígitos se toman como separador de miles.
+    """
+    decimal = DECIMAL_SEPARATORS.get(decimal, decimal)
+    values = pd.to_numeric(series, errors='coerce')
+    null = series.isna().to_numpy(dtype=bool)
+    is_text = ~null & series.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    if decimal == ',':
+        # pd.to_numeric leería "1.200" como 1.2, así que todo texto pasa por la limpieza
+        pending = is_text
+    else:
+        pending = ~null & values.isna().to_numpy(dtype=bool)
+        if decimal is None and is_text.any():
+            texts = pd.Series(series[is_text].to_numpy(dtype=object), dtype=object)
+            pending[np.flatnonzero(is_text)] |= texts.str.fullmatch(_THOUSANDS_DOT_PATTERN).to_numpy(dtype=bool)
+
+    status = np.full(len(series), STATUS_OK, dtype=np.int8)
+    status[null] = STATUS_NULL
+    if pending.any():
+        positions = np.flatnonzero(pending)
+        texts = series.iloc[positions]
+        parsed = {text: _parse_text(text, decimal) for text in pd.unique(texts)}
+        cleaned = texts.map(parsed).to_numpy(dtype=float)
+        values = values.astype(float)
+        values.iloc[positions] = cleaned
+        status[positions] = np.where(np.isnan(cleaned), STATUS_INVALID, STATUS_NORMALIZED)
+    return values, pd.Series(status, index=series.index, name=series.name)
+
+def normalize_numeric_columns(data, columns=NUMERIC_COLUMNS, decimal=None):
+    """Reemplaza en `data` las columnas numéricas por sus valores normalizados.
+
+    Devuelve un DataFrame con el código de estado de cada fila y columna (ver STATUS_*).
+    """
+    status = pd.DataFrame(index=data.index)
+    for column in columns:
+        if column in data.columns:
+            data[column], status[column] = parse_numbers(data[column], decimal)
+    return status
+
+def _parse_text(text, decimal):
+    match = _NUMBER_PATTERN.match(str(text).strip())
+    if match is None or bool(match.group('open')) != bool(match.group('close')):
+        return np.nan
+    if match.group('sign') and match.group('inner_sign'):
+        return np.nan
+    digits = match.group('digits').replace(' ', '').replace("'", '')
+    number = _resolve_separators(digits, decimal)
+    if number is None:
+        return np.nan
+    negative = '-' in (match.group('sign'), match.group('inner_sign')) or bool(match.group('open'))
+    return -float(number) if negative else float(number)
+
+def _resolve_separators(digits, decimal):
+    """Deja sólo dígitos y, como mucho, un punto decimal."""
+    if decimal is None:
+        last_dot, last_comma = digits.rfind('.'), digits.rfind(',')
+        if last_dot >= 0 and last_comma >= 0:
+            decimal = '.' if last_dot > last_comma else ','
+        elif last_comma >= 0:
+            single = digits.count(',') == 1
+            decimal = ',' if single and len(digits) - last_comma - 1 != 3 else '.'
+        else:
+            single = digits.count('.') == 1
+            decimal = '.' if single and len(digits) - digits.rfind('.') - 1 != 3 else ','
+    thousands = ',' if decimal == '.' else '.'
+    number = digits.replace(thousands, '')
+    if number.count(decimal) > 1:
+        return None
+    return number.replace(decimal, '.')
@@ -0,0 +1,99 @@
+import contextlib
+import cProfile
+import os
+import platform
+import re
+import time
+import tracemalloc
+from openpyxl import Workbook, load_workbook
+
+try:
+    import resource
+except ImportError:  # Windows: sin getrusage el pico sólo se mide con trace_memory
+    resource = None
+
+'''@uthor: José Luis García Quinayás
+City: Popayán - Cauca
+Date: 18/Oct/2026'''
+
+# Encabezados de la hoja de instrumentación
+METRICS_HEADER = ["Fase", "Tiempo (s)", "Tiempo CPU (s)", "Filas revisadas", "Memoria pico (MB)", "Perfil cProfile"]
+
+def peak_rss_bytes():
+    """Pico de memoria residente del proceso hasta ahora, o None si no se puede medir."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KB y macOS bytes
+    return peak if platform.system() == 'Darwin' else peak * 1024
+
+@contextlib.contextmanager
+def instrument(metrics, phase, rows, profile_threshold=None, profile_dir=".", trace_memory=False):
+    """Mide una fase y agrega a `metrics` su tiempo, tiempo de CPU, filas y pico de memoria.
+
+    Por defecto el pico de memoria es cuánto creció el pico de RSS del proceso durante la fase,
+    que no cuesta nada medir pero vale 0 si la fase no supera un pico anterior. Con `trace_memory`
+    se usa tracemalloc para obtener el máximo asignado durante la fase, a costa de hacerla
+    bastante más lenta. Con `profile_threshold` (segundos) la fase corre bajo cProfile y, si tarda
+    más que el umbral, el perfil se guarda en `profile_dir`. Las fases no se deben anidar.
+    """
+    if trace_memory:
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+    else:
+        start_memory = peak_rss_bytes()
+    profiler = cProfile.Profile() if profile_threshold is not None else None
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        wall = time.perf_counter() - start_wall
+        cpu = time.process_time() - start_cpu
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1] - start_memory
+            if not was_tracing:
+                tracemalloc.stop()
+        else:
+            peak = None if start_memory is None else peak_rss_bytes() - start_memory
+        profile_path = None
+        if profiler and wall > profile_threshold:
+            os.makedirs(profile_dir, exist_ok=True)
+            profile_path = os.path.join(profile_dir, re.sub(r'[^\w.-]+', '_', phase) + ".prof")
+            profiler.dump_stats(profile_path)
+        metrics.append({"phase": phase, "wall_s": round(wall, 4), "cpu_s": round(cpu, 4), "rows": rows,
+                        "peak_mb": None if peak is None else round(max(peak, 0) / (1024 * 1024), 2),
+                        "profile": profile_path})
+
+def write_metrics_sheet(wb, title, metrics):
+    """Escribe (o reemplaza) en el libro `wb` una hoja con las métricas de cada fase."""
+    if title in wb.sheetnames:
+        del wb[title]
+    ws = wb.create_sheet(title)
+    ws.append(METRICS_HEADER)
+    for metric in metrics:
+        ws.append([metric["phase"], metric["wall_s"], metric["cpu_s"], metric["rows"], metric["peak_mb"],
+                   metric["profile"] or ""])
+    return ws
+
+def save_metrics_sheet(path, title, metrics):
+    """Agrega la hoja de métricas a un libro existente (por ejemplo test_report.xlsx) o crea uno nuevo."""
+    if os.path.exists(path):
+        wb = load_workbook(path)
+    else:
+        wb = Workbook()
+        wb.remove(wb.active)
+    write_metrics_sheet(wb, title, metrics)
+    wb.save(path)
+
+def print_metrics(metrics):
+    for metric in metrics:
+        profile = f" - perfil: {metric['profile']}" if metric["profile"] else ""
+        print(f"{metric['phase']}: {metric['wall_s']} s (CPU {metric['cpu_s']} s), {metric['rows']} filas, "
+              f"pico {metric['peak_mb']} MB{profile}")
@@ -0,0 +1,97 @@
+import os
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+from openpyxl.utils import get_column_letter
+
+'''@uthor: José Luis García Quinayás
+City: Popayán - Cauca
+Date: 18/Oct/2026'''
+
+# Formatos de salida de los reportes (la extensión del archivo decide el formato)
+REPORT_FORMATS = ['xlsx', 'csv', 'parquet']
+
+# Filas que se convierten a la vez antes de pasarlas al libro
+WRITE_BLOCK_SIZE = 10000
+
+# Mismo estilo de encabezado que usa DataFrame.to_excel
+_THIN = Side(style='thin')
+_HEADER_FONT = Font(bold=True)
+_HEADER_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+_HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='top')
+
+def write_report_frame(data, path):
+    """Guarda `data` sin índice en `path`, en Excel, CSV o Parquet según su extensión."""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension == 'xlsx':
+        write_xlsx(data, path)
+    elif extension == 'csv':
+        data.to_csv(path, index=False, encoding='utf-8')
+    elif extension == 'parquet':
+        _with_mixed_as_text(data).to_parquet(path, index=False)
+    else:
+        raise ValueError(f"Formato de reporte no soportado: {path} (use {', '.join(REPORT_FORMATS)})")
+    return path
+
+def _with_mixed_as_text(data):
+    """Copia de `data` con las columnas que mezclan tipos (p. ej. fechas y textos) convertidas a texto.
+
+    Arrow exige un solo tipo por columna; los nulos se conservan como nulos.
+    """
+    mixed = [column for column in data.columns
+             if data[column].dtype == object
+             and pd.api.types.infer_dtype(data[column], skipna=True) in ('mixed', 'mixed-integer')]
+    if not mixed:
+        return data
+    data = data.copy(deep=False)
+    for column in mixed:
+        data[column] = data[column].map(str).where(data[column].notna(), None)
+    return data
+
+def write_xlsx(data, path, sheet_name="Sheet1"):
+    """Escribe un Excel con openpyxl en modo write-only, que vuelca las filas a disco a medida que llegan.
+
+    A diferencia de DataFrame.to_excel no se crea un objeto celda por cada valor, así que la memoria
+    no crece con el número de filas. Los nulos quedan como celdas vacías, igual que con to_excel.
+    """
+    wb = Workbook(write_only=True)
+    _append_frame(wb.create_sheet(sheet_name), data)
+    wb.save(path)
+
+def write_consolidated(data, flags, path, summary=None):
+    """Guarda los datos una sola vez junto a `flags`, una columna booleana por regla.
+
+    En Excel los datos van en la hoja "Datos" con autofiltro, para obtener cada reporte filtrando
+    su columna, y `summary` (filas [criterio, columna, registros, reporte]) va en la hoja "Resumen".
+    En CSV o Parquet se guarda sólo la tabla de datos con las marcas.
+    """
+    combined = pd.concat([data, flags], axis=1)
+    if os.path.splitext(path)[1].lower() != '.xlsx':
+        return write_report_frame(combined, path)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Datos")
+    ws.auto_filter.ref = f"A1:{get_column_letter(max(len(combined.columns), 1))}{len(combined) + 1}"
+    _append_frame(ws, combined)
+    if summary is not None:
+        _append_frame(wb.create_sheet("Resumen"),
+                      pd.DataFrame(summary, columns=["Criterio", "Columna", "Registros", "Reporte"]))
+    wb.save(path)
+    return path
+
+def _append_frame(ws, data):
+    ws.append([_header_cell(ws, column) for column in data.columns])
+    for start in range(0, len(data), WRITE_BLOCK_SIZE):
+        block = data.iloc[start:start + WRITE_BLOCK_SIZE]
+        # Conversión por columna: tolist() entrega tipos de Python y los nulos pasan a None
+        columns = [block[column].astype(object).where(block[column].notna(), None).tolist()
+                   for column in block.columns]
+        for row in zip(*columns):
+            ws.append(row)
+
+def _header_cell(ws, value):
+    cell = WriteOnlyCell(ws, value=str(value))
+    cell.font = _HEADER_FONT
+    cell.border = _HEADER_BORDER
+    cell.alignment = _HEADER_ALIGNMENT
+    return cell
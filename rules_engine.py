@@ -0,0 +1,197 @@
+import numpy as np
+import pandas as pd
+
+from date_parsing import DATE_FORMAT, STATUS_MALFORMED, STATUS_OUT_OF_RANGE, mark_out_of_range, parse_dates
+
+'''@uthor: José Luis García Quinayás
+City: Popayán - Cauca
+Date: 18/Oct/2026'''
+
+# Patrón amplio de caracteres especiales: cualquier carácter que no sea letra ASCII ni espacio.
+# Un dígito, un acento o un símbolo lo cumplen, por eso sirve de filtro previo para reglas más finas.
+SPECIAL_CHARS_PATTERN = r'[^a-zA-Z\s]'
+
+### Predicados disponibles para declarar las reglas de cada caso
+
+def contains(column, pattern, within=None):
+    """Incumple si el texto de `column` contiene `pattern`.
+
+    `within` es un patrón más amplio que siempre coincide cuando `pattern` coincide; el motor
+    lo evalúa una sola vez por columna y aplica `pattern` únicamente sobre esas filas.
+    """
+    return {"kind": "contains", "column": column, "arg": pattern, "within": within}
+
+def not_in(column, values):
+    """Incumple si el valor de `column` no pertenece a `values`."""
+    return {"kind": "not_in", "column": column, "arg": tuple(values), "within": None}
+
+def is_null(column):
+    """Incumple si el valor de `column` es nulo."""
+    return {"kind": "is_null", "column": column, "arg": None, "within": None}
+
+def not_positive(column):
+    """Incumple si el valor numérico de `column` es cero o negativo."""
+    return {"kind": "not_positive", "column": column, "arg": None, "within": None}
+
+def malformed_date(column, date_format=DATE_FORMAT):
+    """Incumple si `column` no es una fecha nativa ni un texto con `date_format` (los nulos no incumplen)."""
+    return {"kind": "date_status", "column": column, "arg": (STATUS_MALFORMED, date_format, None, None),
+            "within": None}
+
+def date_out_of_range(column, min_date=None, max_date=None, date_format=DATE_FORMAT):
+    """Incumple si la fecha de `column` es válida pero queda fuera de [min_date, max_date]."""
+    return {"kind": "date_status", "column": column, "arg": (STATUS_OUT_OF_RANGE, date_format, min_date, max_date),
+            "within": None}
+
+### Compilación del plan
+
+def compile_plan(cases):
+    """Agrupa los predicados de todos los casos por columna.
+
+    Los predicados idénticos se evalúan una sola vez aunque varios casos los usen. El plan
+    resultante se reutiliza para cualquier DataFrame (o bloque) con las mismas columnas.
+    """
+    columns = {}
+    for case in cases:
+        for rule in case["rules"]:
+            predicates = columns.setdefault(rule["column"], {})
+            key = (rule["kind"], rule["arg"], rule["within"])
+            predicates.setdefault(key, []).append(case["test_id"])
+    return {"cases": [case["test_id"] for case in cases], "columns": columns}
+
+### Evaluación
+
+def evaluate(plan, data):
+    """Evalúa el plan sobre `data` recorriendo cada columna una sola vez.
+
+    Devuelve la matriz booleana de incumplimientos (filas x casos) y un diccionario con la
+    primera excepción encontrada por caso; las columnas de casos con error quedan en False.
+    """
+    masks, errors = evaluate_masks(plan, data)
+    return pd.DataFrame(masks, index=data.index, columns=plan["cases"]), errors
+
+def evaluate_masks(plan, data):
+    """Como evaluate, pero devuelve un arreglo booleano por caso sin construir un DataFrame."""
+    masks = {test_id: np.zeros(len(data), dtype=bool) for test_id in plan["cases"]}
+    errors = {}
+    for column, predicates in plan["columns"].items():
+        for key, test_ids, result in _scan_column(data, column, predicates):
+            if isinstance(result, Exception):
+                for test_id in test_ids:
+                    errors.setdefault(test_id, result)
+                continue
+            for test_id in test_ids:
+                masks[test_id] |= result
+    for test_id in errors:
+        masks[test_id][:] = False
+    return masks, errors
+
+def restrict_plan(plan, test_ids):
+    """Plan con sólo los casos de `test_ids`; los predicados que ningún caso usa se descartan."""
+    keep = set(test_ids)
+    columns = {}
+    for column, predicates in plan["columns"].items():
+        kept = {key: [test_id for test_id in ids if test_id in keep] for key, ids in predicates.items()}
+        kept = {key: ids for key, ids in kept.items() if ids}
+        if kept:
+            columns[column] = kept
+    return {"cases": [test_id for test_id in plan["cases"] if test_id in keep], "columns": columns}
+
+def find_violations(plan, chunks, max_samples=1):
+    """Recorre los bloques de `chunks` sólo hasta decidir cada caso (modo gate).
+
+    Un caso queda decidido al encontrar `max_samples` filas que lo incumplen o al fallar su
+    chequeo; los bloques siguientes sólo evalúan los casos pendientes y la lectura se detiene
+    cuando no queda ninguno, así que `chunks` puede ser un generador perezoso. Devuelve
+    (muestras, errores, filas revisadas), donde muestras asocia cada caso con un DataFrame de
+    sus filas de ejemplo, vacío si el caso pasó.
+    """
+    samples = {test_id: [] for test_id in plan["cases"]}
+    found = dict.fromkeys(plan["cases"], 0)
+    errors = {}
+    pending = list(plan["cases"])
+    rows = 0
+    for chunk in chunks:
+        masks, chunk_errors = evaluate_masks(restrict_plan(plan, pending), chunk)
+        errors.update(chunk_errors)
+        for test_id in pending:
+            if test_id in chunk_errors:
+                continue
+            positions = np.flatnonzero(masks[test_id])[:max_samples - found[test_id]]
+            if len(positions):
+                samples[test_id].append(chunk.iloc[positions])
+                found[test_id] += len(positions)
+        rows += len(chunk)
+        pending = [test_id for test_id in pending if test_id not in errors and found[test_id] < max_samples]
+        if not pending:
+            break
+    samples = {test_id: pd.concat(frames) if frames else pd.DataFrame() for test_id, frames in samples.items()}
+    return samples, errors, rows
+
+def _scan_column(data, column, predicates):
+    """Evalúa todos los predicados de una columna, compartiendo los filtros previos."""
+    try:
+        series = data[column]
+    except KeyError as e:
+        for key, test_ids in predicates.items():
+            yield key, test_ids, e
+        return
+
+    # En una columna categórica cada predicado ya se evalúa una vez por valor distinto,
+    # así que el filtro previo no ahorra nada
+    categorical = isinstance(series.dtype, pd.CategoricalDtype)
+    guards = {}
+    # Conversión de la columna por formato de fecha, compartida por todos los predicados de fechas
+    dates = {}
+    # Primero los predicados sin filtro: sus resultados de 'contains' sirven de filtro a los demás
+    for key, test_ids in sorted(predicates.items(), key=lambda item: item[0][2] is not None):
+        kind, arg, within = key
+        try:
+            if kind == "date_status":
+                result = _date_status_mask(series, arg, dates)
+            elif within is None or categorical:
+                result = _evaluate_predicate(series, kind, arg)
+                if kind == "contains":
+                    guards[arg] = result
+            else:
+                if within not in guards:
+                    guards[within] = series.str.contains(within, regex=True, na=False).to_numpy(dtype=bool)
+                guard = guards[within]
+                result = np.zeros(len(series), dtype=bool)
+                result[guard] = _evaluate_predicate(series[guard], kind, arg)
+        except Exception as e:
+            yield key, test_ids, e
+            continue
+        yield key, test_ids, result
+
+def _evaluate_predicate(series, kind, arg):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return _evaluate_categorical(series, kind, arg)
+    if kind == "contains":
+        mask = series.str.contains(arg, regex=True, na=False)
+    elif kind == "not_in":
+        mask = ~series.isin(arg)
+    elif kind == "is_null":
+        mask = series.isnull()
+    elif kind == "not_positive":
+        mask = series <= 0
+    elif kind == "date_status":
+        return _date_status_mask(series, arg, {})
+    else:
+        raise ValueError(f"Tipo de predicado desconocido: {kind}")
+    return mask.to_numpy(dtype=bool)
+
+def _date_status_mask(series, arg, dates):
+    """Filas con el estado de fecha pedido; `dates` guarda la conversión de cada formato ya hecha."""
+    status, date_format, min_date, max_date = arg
+    if date_format not in dates:
+        dates[date_format] = parse_dates(series, date_format)
+    values, statuses = dates[date_format]
+    return (mark_out_of_range(values, statuses, min_date, max_date) == status).to_numpy(dtype=bool)
+
+def _evaluate_categorical(series, kind, arg):
+    """Evalúa el predicado sobre los valores distintos y lo expande a las filas con los códigos."""
+    categories = series.cat.categories
+    # Un valor más al final para el nulo, al que apunta el código -1
+    values = pd.Series(categories).reindex(range(len(categories) + 1))
+    return _evaluate_predicate(values, kind, arg)[series.cat.codes.to_numpy()]
@@ -1,11 +1,22 @@
+import argparse
+import sys
 import pandas as pd
 from openpyxl import Workbook
 
+from data_loader import DEFAULT_CHUNK_SIZE, cache_file, iter_excel_chunks, load_sales
+from incremental import evaluate_incremental
+from number_parsing import DECIMAL_SEPARATORS, normalize_numeric_columns
+from profiling import instrument, print_metrics, write_metrics_sheet
+from rules_engine import (SPECIAL_CHARS_PATTERN, compile_plan, contains, date_out_of_range, evaluate,
+                          find_violations, is_null, malformed_date, not_in, not_positive, restrict_plan)
+
 # Ruta para el reporte Excel
 report_path = "O:\\test_qa_engineer\\test_report.xlsx"
 
-df = "O:\\test_qa_engineer\\ventas1.xlsx"
-data = pd.read_excel(df)
+# ubicación del archivo ventas
+file_path = "O:\\jose-test\\ventas1.xlsx"
+# Separador decimal de los textos numéricos: None lo detecta, 'en' = punto, 'es' = coma
+decimal = None
 
 # Preparación del reporte
 wb = Workbook()
@@ -19,177 +30,352 @@ ws['A4'] = "Versión 1.0"
 ws['A5'] = ""
 ws['F1'] = "Copyright: DataKnow"
 ws.append(["ID Caso", "Descripción Caso de Prueba", "Resultado", "Descripción del Resultado", "Número de Incidentes", "Observaciones"])
+# Primera fila de resultados, debajo de los encabezados
+RESULTS_START_ROW = ws.max_row + 1
+
+# Convertir columnas a numérico (acepta símbolos de moneda y separadores de miles)
+def convert_numeric_columns(data):
+    normalize_numeric_columns(data, decimal=decimal)
+    return data
 
 # Cargar dataset
-def load_data():
+def load_data(path=file_path, use_cache=True):
     try:
-        data = pd.read_excel("O:\\jose-test\\ventas1.xlsx")
-        # Convertir columnas a numérico según sea necesario
-        data['precio'] = pd.to_numeric(data['precio'], errors='coerce')
-        data['cantidad_vendida'] = pd.to_numeric(data['cantidad_vendida'], errors='coerce')
-        data['total_venta'] = pd.to_numeric(data['total_venta'], errors='coerce')
-        return data
+        return convert_numeric_columns(load_sales(path, use_cache))
     except Exception as e:
         print(f"Error loading data: {e}")
 
-data = load_data()
-
 # Función para registrar resultados en Excel
 def record_result(test_id, description, result, result_description, incidents, comments):
     ws.append([test_id, description, result, result_description, incidents, comments])
 
-### Funciones de Validación
+### Casos de prueba
+# Cada caso declara sus reglas por columna; una fila incumple el caso si incumple cualquiera de ellas.
+# Todas las reglas se compilan en un único plan que recorre cada columna una sola vez.
+
+# Campos de texto revisados por los casos 03 y 05
+STRING_COLUMNS = ['nombre_cliente', 'nombre_producto', 'categoria', 'region', 'metodo_pago']
+
+# Rango aceptado para 'fecha_venta' (inclusive); fuera de él la fecha es sospechosa aunque esté bien escrita
+FECHA_VENTA_RANGE = ('2000-01-01', '2099-12-31')
+
+# Números o caracteres especiales (casos 09 a 12); toda coincidencia también cumple SPECIAL_CHARS_PATTERN
+NUMBERS_SPECIALS_PATTERN = r'[0-9]|[^\w\s]'
+
+CASES = [
+    {"test_id": "Caso 01",
+     "description": "Verificar formato de fecha del campo'fecha_venta' (AAAA-MM-DD)",
+     "label": "Fechas no validas",
+     "rules": [is_null('fecha_venta'), malformed_date('fecha_venta'),
+               date_out_of_range('fecha_venta', *FECHA_VENTA_RANGE)],
+     # Nombre del sub-conteo de cada regla, que se muestra en la descripción del resultado
+     "breakdown": ["nulas", "mal formadas", "fuera de rango"],
+     "error_comment": "Error de validación del formato de fecha"},
+    {"test_id": "Caso 02",
+     "description": "Verificar números positivos para los campos 'id_producto', 'precio', 'cantidad_vendida', 'total_venta'",
+     "label": "Valores negativos o cero",
+     "rules": [not_positive(col) for col in ['precio', 'cantidad_vendida', 'total_venta']],
+     "errors": TypeError,
+     "error_description": "Error encontrado; asegurar valores numéricos",
+     "error_comment": "Conversion requerida a tipo número"},
+    {"test_id": "Caso 03",
+     "description": "Verificar que no hay números en 'nombre_cliente', 'nombre_producto', 'categoria', 'region', 'metodo_pago'",
+     "label": "Campos que contienen números",
+     "rules": [contains(col, r'\d', within=SPECIAL_CHARS_PATTERN) for col in STRING_COLUMNS],
+     "error_comment": "Error al Verificar campos de caracteres"},
+    {"test_id": "Caso 04",
+     "description": "Verificar de que no haya valores nulos o vacíos en todos los campos.",
+     "label": "Campos nulos/vacíos",
+     "rules": [is_null(col) for col in ['fecha_venta', 'nombre_producto', 'categoria', 'precio', 'cantidad_vendida',
+                                        'total_venta', 'nombre_cliente', 'region', 'metodo_pago']],
+     "error_comment": "Comprobación de errores del campo for nulls"},
+    {"test_id": "Caso 05",
+     "description": "Verificar que no haya caracteres especiales en los campos de cadena",
+     "label": "Caracteres especiales encontrados",
+     "rules": [contains(col, SPECIAL_CHARS_PATTERN) for col in STRING_COLUMNS],
+     "error_comment": "Error al Verificar caracteres especiales"},
+    {"test_id": "Caso 06",
+     "description": "Verificar que la región sólo contiene opciones válidas (Norte, Sur, Este, Oeste, Centro)",
+     "label": "Regiones no válidas",
+     "rules": [not_in('region', ['Norte', 'Sur', 'Este', 'Oeste', 'Centro'])],
+     "error_comment": "Comprobación de errores del campo region"},
+    {"test_id": "Caso 07",
+     "description": "Verificar que el campo 'metodo_pago' contiene sólo 'Efectivo' o 'Transferencia Bancaria'",
+     "label": "Métodos de pago no válidos",
+     "rules": [not_in('metodo_pago', ['Efectivo', 'Transferencia Bancaria'])],
+     "error_comment": "Error de validación del método de pago"},
+    {"test_id": "Caso 08",
+     "description": "Verificar que el campo 'metodo_pago' no contiene palabras acentuadas",
+     "label": "Problemas de acentos",
+     "rules": [contains('metodo_pago', r'(?<!Transferencia) Bancaria')],
+     "error_comment": "Comprobación de errores del campo payment method"},
+    {"test_id": "Caso 09",
+     "description": "Verificar que 'nombre_cliente' no contiene números ni caracteres especiales",
+     "label": "Los 'nombre_cliente' no válidos",
+     "rules": [contains('nombre_cliente', NUMBERS_SPECIALS_PATTERN, within=SPECIAL_CHARS_PATTERN)],
+     "error_comment": "Comprobación de errores del campo 'nombre_cliente'"},
+    {"test_id": "Caso 10",
+     "description": "Verificar que 'nombre_producto' no contiene números ni caracteres especiales",
+     "label": "El 'nombre_producto' no válidos",
+     "rules": [contains('nombre_producto', NUMBERS_SPECIALS_PATTERN, within=SPECIAL_CHARS_PATTERN)],
+     "error_comment": "Comprobación de errores del campo 'nombre_producto'"},
+    {"test_id": "Caso 11",
+     "description": "Verificar que 'categoria' no contiene números ni caracteres especiales",
+     "label": "Las 'categoria' no válidas",
+     "rules": [contains('categoria', NUMBERS_SPECIALS_PATTERN, within=SPECIAL_CHARS_PATTERN)],
+     "error_comment": "Comprobación de errores del campo 'categoria'"},
+    {"test_id": "Caso 12",
+     "description": "Verificar que 'metodo_pago' no contiene números ni caracteres especiales",
+     "label": "Los 'metodo_pago' inválidos",
+     "rules": [contains('metodo_pago', NUMBERS_SPECIALS_PATTERN, within=SPECIAL_CHARS_PATTERN)],
+     "error_comment": "Comprobación de errores del campo 'metodo_pago'"},
+]
+CASES_BY_ID = {case["test_id"]: case for case in CASES}
+CASE_IDS = [case["test_id"] for case in CASES]
+
+# Sub-conteos: un caso auxiliar por regla de los casos con "breakdown". Usan los mismos predicados
+# que su caso, así que el plan no los evalúa dos veces
+def breakdown_id(case, name):
+    return f"{case['test_id']} ({name})"
+
+def breakdown_cases(cases):
+    return [{"test_id": breakdown_id(case, name), "rules": [rule]}
+            for case in cases for name, rule in zip(case.get("breakdown", []), case["rules"])]
+
+# Plan de `cases` junto con sus sub-conteos
+def case_plan(cases):
+    return compile_plan(cases + breakdown_cases(cases))
+
+PLAN = case_plan(CASES)
+# Identifica las reglas en el estado del modo incremental; si cambian se vuelve a evaluar todo
+PLAN_SIGNATURE = repr(PLAN)
+
+# Matriz de incumplimientos (filas x casos) y errores por caso para todos los casos a la vez
+def build_violation_matrix(data, plan=PLAN):
+    return evaluate(plan, data)
+
+# Fila del reporte [ID, descripción, resultado, descripción del resultado, incidentes, observaciones] de un caso
+def case_result(case, incidents, breakdown=None):
+    result = "Aprobado" if incidents == 0 else "Fallido"
+    result_description = f"{case['label']}: {incidents}"
+    if breakdown:
+        result_description += " (" + ", ".join(f"{name}: {count}" for name, count in breakdown.items()) + ")"
+    return [case["test_id"], case["description"], result, result_description, incidents, ""]
+
+# Fila del reporte de un caso cuyo chequeo lanzó una excepción; las no previstas por el caso se propagan
+def case_error_result(case, error):
+    if not isinstance(error, case.get("errors", Exception)):
+        raise error
+    return [case["test_id"], case["description"], "Fallido", case.get("error_description", str(error)), 1,
+            case["error_comment"]]
+
+# Filas del reporte de los casos a partir de los incidentes acumulados
+def case_results(incidents, errors, cases=CASES):
+    return [case_error_result(case, errors[case["test_id"]]) if case["test_id"] in errors
+            else case_result(case, int(incidents[case["test_id"]]),
+                             {name: int(incidents.get(breakdown_id(case, name), 0))
+                              for name in case.get("breakdown", [])})
+            for case in cases]
+
+# Registrar todos los casos a partir de los incidentes acumulados
+def record_cases(incidents, errors):
+    for row in case_results(incidents, errors):
+        record_result(*row)
+
+def validate_case(test_id, data):
+    case = CASES_BY_ID[test_id]
+    matrix, errors = evaluate(case_plan([case]), data)
+    for row in case_results(matrix.sum(), errors, [case]):
+        record_result(*row)
 
-# 1. Verificar formato de fecha (YYYY-MM-DD)
 def validate_date_format(data):
-    test_id = "Caso 01"
-    description = "Verificar formato de fecha del campo'fecha_venta' (AAAA-MM-DD)"
-    try:
-        incorrect_dates = data[~data['fecha_venta'].astype(str).str.match(r'^\d{4}-\d{2}-\d{2}$')]
-        result = "Aprobado" if incorrect_dates.empty else "Fallido"
-        record_result(test_id, description, result, f"Fechas no validas: {len(incorrect_dates)}", len(incorrect_dates), "")
-    except Exception as e:
-        record_result(test_id, description, "Fallido", str(e), 1, "Error de validación del formato de fecha")
+    validate_case("Caso 01", data)
 
-# 2. Verificar valores numéricos positivos
 def validate_positive_numbers(data):
-    test_id = "Caso 02"
-    description = "Verificar números positivos para los campos 'id_producto', 'precio', 'cantidad_vendida', 'total_venta'"
-    try:
-        incorrect_values = data[(data[['precio', 'cantidad_vendida', 'total_venta']] <= 0).any(axis=1)]
-        result = "Aprobado" if incorrect_values.empty else "Fallido"
-        record_result(test_id, description, result, f"Valores negativos o cero: {len(incorrect_values)}", len(incorrect_values), "")
-    except TypeError:
-        record_result(test_id, description, "Fallido", "Error encontrado; asegurar valores numéricos", 1, "Conversion requerida a tipo número")
+    validate_case("Caso 02", data)
 
-# 3. Verificar campos no numéricos en ciertos campos
 def validate_no_numbers_in_strings(data):
-    test_id = "Caso 03"
-    description = "Verificar que no hay números en 'nombre_cliente', 'nombre_producto', 'categoria', 'region', 'metodo_pago'"
-    try:
-        invalid_strings = data[(data[['nombre_cliente', 'nombre_producto', 'categoria', 'region', 'metodo_pago']]
-                               .apply(lambda x: x.str.contains(r'\d', na=False))).any(axis=1)]
-        result = "Aprobado" if invalid_strings.empty else "Fallido"
-        record_result(test_id, description, result, f"Campos que contienen números: {len(invalid_strings)}", len(invalid_strings), "")
-    except Exception as e:
-        record_result(test_id, description, "Fallido", str(e), 1, "Error al Verificar campos de caracteres")
+    validate_case("Caso 03", data)
 
-# 4. Verificar que no haya datos vacíos o nulos
 def validate_no_nulls(data):
-    test_id = "Caso 04"
-    description = "Verificar de que no haya valores nulos o vacíos en todos los campos."
-    try:
-        empty_fields = data[data[['fecha_venta', 'nombre_producto', 'categoria', 'precio', 'cantidad_vendida', 'total_venta', 
-                                  'nombre_cliente', 'region', 'metodo_pago']].isnull().any(axis=1)]
-        result = "Aprobado" if empty_fields.empty else "Fallido"
-        record_result(test_id, description, result, f"Campos nulos/vacíos: {len(empty_fields)}", len(empty_fields), "")
-    except Exception as e:
-        record_result(test_id, description, "Fallido", str(e), 1, "Comprobación de errores del campo for nulls")
+    validate_case("Caso 04", data)
 
-# 5. Verificar caracteres especiales en campos string
 def validate_no_special_chars(data):
-    test_id = "Caso 05"
-    description = "Verificar que no haya caracteres especiales en los campos de cadena"
-    try:
-        special_chars = data[(data[['nombre_cliente', 'nombre_producto', 'categoria', 'region', 'metodo_pago']]
-                              .apply(lambda x: x.str.contains(r'[^a-zA-Z\s]', na=False))).any(axis=1)]
-        result = "Aprobado" if special_chars.empty else "Fallido"
-        record_result(test_id, description, result, f"Caracteres especiales encontrados: {len(special_chars)}", len(special_chars), "")
-    except Exception as e:
-        record_result(test_id, description, "Fallido", str(e), 1, "Error al Verificar caracteres especiales")
+    validate_case("Caso 05", data)
 
-# 6. Verificar regiones válidas
 def validate_region(data):
-    test_id = "Caso 06"
-    description = "Verificar que la región sólo contiene opciones válidas (Norte, Sur, Este, Oeste, Centro)"
-    try:
-        invalid_regions = data[~data['region'].isin(['Norte', 'Sur', 'Este', 'Oeste', 'Centro'])]
-        result = "Aprobado" if invalid_regions.empty else "Fallido"
-        record_result(test_id, description, result, f"Regiones no válidas: {len(invalid_regions)}", len(invalid_regions), "")
-    except Exception as e:
-        record_result(test_id, description, "Fallido", str(e), 1, "Comprobación de errores del campo region")
+    validate_case("Caso 06", data)
 
-# 7. Verificar opciones de método de pago válidas
 def validate_payment_method(data):
-    test_id = "Caso 07"
-    description = "Verificar que el campo 'metodo_pago' contiene sólo 'Efectivo' o 'Transferencia Bancaria'"
-    try:
-        invalid_methods = data[~data['metodo_pago'].isin(['Efectivo', 'Transferencia Bancaria'])]
-        result = "Aprobado" if invalid_methods.empty else "Fallido"
-        record_result(test_id, description, result, f"Métodos de pago no válidos: {len(invalid_methods)}", len(invalid_methods), "")
-    except Exception as e:
-        record_result(test_id, description, "Fallido", str(e), 1, "Error de validación del método de pago")
-# 8. Verificar opciones acentuadas en metodo_pago
+    validate_case("Caso 07", data)
+
 def validate_accented_payment_method(data):
-    test_id = "Caso 08"
-    description = "Verificar que el campo 'metodo_pago' no contiene palabras acentuadas"
-    try:
-        invalid_entries = data[data['metodo_pago'].str.contains(r'(?<!Transferencia) Bancaria', regex=True, na=False)]
-        result = "Aprobado" if invalid_entries.empty else "Fallido"
-        record_result(test_id, description, result, f"Problemas de acentos: {len(invalid_entries)}", len(invalid_entries), "")
-    except Exception as e:
-        record_result(test_id, description, "Fallido", str(e), 1, "Comprobación de errores del campo payment method")
+    validate_case("Caso 08", data)
 
-# 9. Verificar que 'nombre_cliente' no contenga números o caracteres especiales
 def validate_cliente_no_numbers_specials(data):
-    test_id = "Caso 09"
-    description = "Verificar que 'nombre_cliente' no contiene números ni caracteres especiales"
-    try:
-        invalid_entries = data[data['nombre_cliente'].str.contains(r'[0-9]|[^\w\s]', regex=True, na=False)]
-        result = "Aprobado" if invalid_entries.empty else "Fallido"
-        record_result(test_id, description, result, f"Los 'nombre_cliente' no válidos: {len(invalid_entries)}", len(invalid_entries), "")
-    except Exception as e:
-        record_result(test_id, description, "Fallido", str(e), 1, "Comprobación de errores del campo 'nombre_cliente'")
+    validate_case("Caso 09", data)
 
-# 10. Verificar que 'nombre_producto' no contenga números o caracteres especiales
 def validate_producto_no_numbers_specials(data):
-    test_id = "Caso 10"
-    description = "Verificar que 'nombre_producto' no contiene números ni caracteres especiales"
-    try:
-        invalid_entries = data[data['nombre_producto'].str.contains(r'[0-9]|[^\w\s]', regex=True, na=False)]
-        result = "Aprobado" if invalid_entries.empty else "Fallido"
-        record_result(test_id, description, result, f"El 'nombre_producto' no válidos: {len(invalid_entries)}", len(invalid_entries), "")
-    except Exception as e:
-        record_result(test_id, description, "Fallido", str(e), 1, "Comprobación de errores del campo 'nombre_producto'")
+    validate_case("Caso 10", data)
 
-# 11. Verificar que 'categoria' no contenga números o caracteres especiales
 def validate_categoria_no_numbers_specials(data):
-    test_id = "Caso 11"
-    description = "Verificar que 'categoria' no contiene números ni caracteres especiales"
-    try:
-        invalid_entries = data[data['categoria'].str.contains(r'[0-9]|[^\w\s]', regex=True, na=False)]
-        result = "Aprobado" if invalid_entries.empty else "Fallido"
-        record_result(test_id, description, result, f"Las 'categoria' no válidas: {len(invalid_entries)}", len(invalid_entries), "")
-    except Exception as e:
-        record_result(test_id, description, "Fallido", str(e), 1, "Comprobación de errores del campo 'categoria'")
+    validate_case("Caso 11", data)
 
-# 12. Verificar que 'metodo_pago' no contenga números o caracteres especiales
 def validate_payment_no_numbers_specials(data):
-    test_id = "Caso 12"
-    description = "Verificar que 'metodo_pago' no contiene números ni caracteres especiales"
-    try:
-        invalid_entries = data[data['metodo_pago'].str.contains(r'[0-9]|[^\w\s]', regex=True, na=False)]
-        result = "Aprobado" if invalid_entries.empty else "Fallido"
-        record_result(test_id, description, result, f"Los 'metodo_pago' inválidos: {len(invalid_entries)}", len(invalid_entries), "")
-    except Exception as e:
-        record_result(test_id, description, "Fallido", str(e), 1, "Comprobación de errores del campo 'metodo_pago'")
+    validate_case("Caso 12", data)
 
 ### Ejecutar las pruebas y generar el reporte
-def run_tests():
-    validate_date_format(data)
-    validate_positive_numbers(data)
-    validate_no_numbers_in_strings(data)
-    validate_no_nulls(data)
-    validate_no_special_chars(data)
-    validate_region(data)
-    validate_payment_method(data)
-    validate_accented_payment_method(data)
-    validate_cliente_no_numbers_specials(data)
-    validate_producto_no_numbers_specials(data)
-    validate_categoria_no_numbers_specials(data)
-    validate_payment_no_numbers_specials(data)
-
-    wb.save(report_path)
-
-run_tests()
-print(f"Reporte guardado en {report_path}")
+def run_tests(data, path=report_path):
+    matrix, errors = build_violation_matrix(data)
+    record_cases(matrix.sum(), errors)
+
+    wb.save(path)
+
+# Modo streaming: recorre el archivo por bloques y acumula los incidentes de cada caso
+def run_tests_chunked(source, path=report_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    incidents = pd.Series(0, index=PLAN["cases"])
+    errors = {}
+    for chunk in iter_excel_chunks(source, chunk_size):
+        matrix, chunk_errors = build_violation_matrix(convert_numeric_columns(chunk))
+        incidents += matrix.sum()
+        for test_id, error in chunk_errors.items():
+            errors.setdefault(test_id, error)
+
+    record_cases(incidents, errors)
+
+    wb.save(path)
+
+# Modo incremental: sólo se evalúan las filas nuevas o modificadas desde la última ejecución
+def run_tests_incremental(data, state_path, path=report_path):
+    matrix, errors, evaluated = evaluate_incremental(data, build_violation_matrix, state_path, PLAN_SIGNATURE)
+    print(f"Filas evaluadas: {evaluated} de {len(data)}")
+    record_cases(matrix.sum(), errors)
+
+    wb.save(path)
+
+# Hoja del reporte con las filas de ejemplo del modo gate
+GATE_SAMPLES_SHEET = "Muestras gate"
+
+# Filas por bloque del modo gate cuando los datos vienen de la caché
+GATE_CHUNK_SIZE = 5000
+
+def _slices(data, chunk_size):
+    for start in range(0, len(data), chunk_size):
+        # Copia superficial: la conversión numérica reemplaza columnas del bloque sin tocar `data`
+        yield data.iloc[start:start + chunk_size].copy(deep=False)
+
+# Modo gate: sólo decide Aprobado/Fallido por caso y deja de revisar un caso en su primera incidencia
+def run_tests_gate(source, path=report_path, use_cache=True, chunk_size=None, max_samples=1):
+    """Valida bloque a bloque hasta decidir cada caso y devuelve los IDs de los casos fallidos.
+
+    Con `chunk_size` el Excel se lee en streaming y la lectura se detiene en cuanto todos los casos
+    están decididos; sin él se usa la caché en bloques de GATE_CHUNK_SIZE filas. Cada caso fallido
+    guarda hasta `max_samples` filas de ejemplo en la hoja GATE_SAMPLES_SHEET.
+    """
+    chunks = iter_excel_chunks(source, chunk_size) if chunk_size else _slices(load_sales(source, use_cache),
+                                                                               GATE_CHUNK_SIZE)
+    # Los sub-conteos no deciden nada en este modo y obligarían a recorrer todo el archivo
+    samples, errors, rows = find_violations(restrict_plan(PLAN, CASE_IDS),
+                                            (convert_numeric_columns(chunk) for chunk in chunks), max_samples)
+    failed = []
+    for case in CASES:
+        test_id = case["test_id"]
+        if test_id in errors:
+            row = case_error_result(case, errors[test_id])
+        else:
+            found = len(samples[test_id])
+            row = case_result(case, found)
+            if found:
+                row[3] = f"{case['label']}: al menos {found}"
+                row[5] = f"Modo gate: revisión detenida tras {found} incidencia(s)"
+        record_result(*row)
+        if row[2] == "Fallido":
+            failed.append(test_id)
+
+    write_gate_samples(samples)
+    wb.save(path)
+    print(f"Filas revisadas: {rows}; casos fallidos: {', '.join(failed) or 'ninguno'}")
+    return failed
+
+# Hoja con las filas de ejemplo de cada caso fallido (Fila Excel cuenta el encabezado como fila 1)
+def write_gate_samples(samples):
+    if GATE_SAMPLES_SHEET in wb.sheetnames:
+        del wb[GATE_SAMPLES_SHEET]
+    sheet = wb.create_sheet(GATE_SAMPLES_SHEET)
+    columns = next((list(sample.columns) for sample in samples.values() if len(sample)), [])
+    sheet.append(["ID Caso", "Fila Excel"] + columns)
+    for test_id, sample in samples.items():
+        values = sample.astype(object).where(sample.notna(), None)
+        for position, row in zip(sample.index, values.itertuples(index=False, name=None)):
+            sheet.append([test_id, position + 2] + list(row))
+
+# Hoja del reporte con la instrumentación de cada fase
+METRICS_SHEET = "Instrumentación casos"
+
+# Modo instrumentado: mide por separado la carga, la conversión numérica y cada caso
+def run_tests_profiled(source, path=report_path, use_cache=True, profile_threshold=None, profile_dir=".",
+                       trace_memory=False):
+    """Ejecuta los casos uno por uno midiendo cada fase y agrega la hoja METRICS_SHEET al reporte.
+
+    Con `profile_threshold` (segundos) se guarda un perfil cProfile de las fases que lo superen.
+    """
+    metrics = []
+    options = {"profile_threshold": profile_threshold, "profile_dir": profile_dir, "trace_memory": trace_memory}
+    with instrument(metrics, "Carga", None, **options):
+        data = load_sales(source, use_cache)
+    metrics[-1]["rows"] = len(data)
+    with instrument(metrics, "Conversión numérica", len(data), **options):
+        convert_numeric_columns(data)
+    for case in CASES:
+        with instrument(metrics, case["test_id"], len(data), **options):
+            validate_case(case["test_id"], data)
+
+    with instrument(metrics, "Guardar reporte", ws.max_row, **options):
+        wb.save(path)
+    # La hoja se escribe después de medir el guardado para incluirlo; el segundo guardado no se mide
+    write_metrics_sheet(wb, METRICS_SHEET, metrics)
+    wb.save(path)
+    print_metrics(metrics)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Casos de prueba de calidad sobre los datos de ventas")
+    parser.add_argument("--file", default=file_path, help="Archivo de ventas a validar")
+    parser.add_argument("--report", default=report_path, help="Ruta del reporte Excel de resultados")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Validar en modo streaming, leyendo el archivo en bloques de N filas")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Leer siempre el Excel en lugar de la caché columnar")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Evaluar sólo las filas nuevas o modificadas desde la última ejecución")
+    parser.add_argument("--profile", action="store_true",
+                        help="Medir tiempo, CPU, filas y memoria de cada fase y caso (hoja extra en el reporte)")
+    parser.add_argument("--profile-threshold", type=float, default=None,
+                        help="Con --profile, guardar un perfil cProfile de las fases que superen N segundos")
+    parser.add_argument("--profile-dir", default=".", help="Carpeta de los perfiles cProfile")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Con --profile, medir la memoria con tracemalloc (más exacto, pero más lento)")
+    parser.add_argument("--gate", action="store_true",
+                        help="Sólo decidir Aprobado/Fallido, deteniéndose en las primeras incidencias "
+                             "(código de salida 1 si algún caso falla)")
+    parser.add_argument("--max-samples", type=int, default=1,
+                        help="Con --gate, filas de ejemplo que se buscan por caso antes de detenerse")
+    parser.add_argument("--decimal", choices=list(DECIMAL_SEPARATORS), default=decimal,
+                        help="Separador decimal de los números escritos como texto (por defecto se detecta)")
+    args = parser.parse_args()
+    decimal = args.decimal
+
+    if args.gate:
+        failed = run_tests_gate(args.file, args.report, not args.no_cache, args.chunk_size, args.max_samples)
+        print(f"Reporte guardado en {args.report}")
+        sys.exit(1 if failed else 0)
+    elif args.chunk_size:
+        run_tests_chunked(args.file, args.report, args.chunk_size)
+    elif args.profile:
+        run_tests_profiled(args.file, args.report, not args.no_cache, args.profile_threshold, args.profile_dir,
+                           args.trace_memory)
+    elif args.incremental:
+        run_tests_incremental(load_data(args.file, not args.no_cache), cache_file(args.file, ".casos.pkl"),
+                              args.report)
+    else:
+        run_tests(load_data(args.file, not args.no_cache), args.report)
+    print(f"Reporte guardado en {args.report}")
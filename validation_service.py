@@ -0,0 +1,182 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import first_reportes
+import tests_cases
+from data_loader import load_sales, source_signature
+
+'''@uthor: José Luis García Quinayás
+City: Popayán - Cauca
+Date: 18/Oct/2026'''
+
+# Campos de cada fila de resultados, en el orden de las columnas del reporte de tests_cases.py
+RESULT_FIELDS = ["test_id", "description", "result", "result_description", "incidents", "comments"]
+
+# Tamaño máximo del encabezado de una petición HTTP
+MAX_HEADER_BYTES = 64 * 1024
+
+class SalesDataset:
+    """Archivo de ventas cargado y normalizado una sola vez, que se recarga cuando cambia en disco.
+
+    Las lecturas del archivo y los chequeos corren en `executor` para no bloquear el ciclo de
+    eventos; mientras se recarga, las peticiones esperan a la versión nueva en lugar de leer dos veces.
+    """
+
+    def __init__(self, path, executor, use_cache=True):
+        self.path = path
+        self.executor = executor
+        self.use_cache = use_cache
+        self.data = None
+        self.signature = None
+        self.loaded_at = None
+        self._lock = asyncio.Lock()
+
+    def _load(self):
+        signature = source_signature(self.path)
+        data = tests_cases.convert_numeric_columns(load_sales(self.path, self.use_cache))
+        return data, signature
+
+    async def current(self, force=False):
+        """Devuelve los datos en memoria, recargándolos antes si el archivo cambió."""
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            signature = await loop.run_in_executor(self.executor, source_signature, self.path)
+            if force or self.data is None or signature != self.signature:
+                started = time.perf_counter()
+                self.data, self.signature = await loop.run_in_executor(self.executor, self._load)
+                self.loaded_at = time.time()
+                print(f"Datos cargados: {self.path} - {len(self.data)} filas "
+                      f"({time.perf_counter() - started:.2f} s)")
+            return self.data
+
+    async def run(self, func, *args):
+        """Ejecuta `func(datos, *args)` en el executor sobre la versión actual; devuelve (datos, resultado)."""
+        data = await self.current()
+        return data, await asyncio.get_running_loop().run_in_executor(self.executor, func, data, *args)
+
+    async def watch(self, interval):
+        """Revisa el archivo cada `interval` segundos para recargarlo antes de la siguiente petición."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.current()
+            except Exception as e:
+                print(f"No se pudo recargar {self.path}: {e}")
+
+### Operaciones del servicio (corren en el executor)
+
+def validate(data, test_ids=None):
+    """Resultados de los casos como los escribe record_result, para todos los casos o sólo `test_ids`."""
+    if test_ids:
+        unknown = [test_id for test_id in test_ids if test_id not in tests_cases.CASES_BY_ID]
+        if unknown:
+            raise KeyError(f"Casos desconocidos: {', '.join(unknown)}")
+        cases = [tests_cases.CASES_BY_ID[test_id] for test_id in test_ids]
+        plan = tests_cases.case_plan(cases)
+    else:
+        cases, plan = tests_cases.CASES, tests_cases.PLAN
+    matrix, errors = tests_cases.build_violation_matrix(data, plan)
+    return [dict(zip(RESULT_FIELDS, row)) for row in tests_cases.case_results(matrix.sum(), errors, cases)]
+
+def report_counts(data):
+    """Conteos de cada criterio de first_reportes.py, sin escribir los archivos de reporte."""
+    counts = first_reportes.build_report_matrix(data).sum()
+    return {label: int(counts[label]) for label in first_reportes.REPORT_FILES}
+
+### Servidor HTTP mínimo sobre asyncio (TCP o socket Unix)
+
+async def handle_request(dataset, method, target):
+    """Resuelve una petición y devuelve (estado HTTP, cuerpo JSON)."""
+    url = urlsplit(target)
+    query = parse_qs(url.query)
+    if method not in ("GET", "POST"):
+        return 405, {"error": f"Método no permitido: {method}"}
+    if url.path == "/health":
+        data = await dataset.current()
+        return 200, {"source": dataset.path, "rows": len(data), "loaded_at": dataset.loaded_at}
+    if url.path == "/validate":
+        test_ids = [test_id for value in query.get("case", []) for test_id in value.split(",") if test_id]
+        try:
+            data, results = await dataset.run(validate, test_ids)
+        except KeyError as e:
+            return 400, {"error": e.args[0]}
+        return 200, {"source": dataset.path, "rows": len(data), "results": results}
+    if url.path == "/reports":
+        data, counts = await dataset.run(report_counts)
+        return 200, {"source": dataset.path, "rows": len(data), "criterios": counts}
+    if url.path == "/reload":
+        data = await dataset.current(force=True)
+        return 200, {"source": dataset.path, "rows": len(data), "loaded_at": dataset.loaded_at}
+    return 404, {"error": f"Ruta desconocida: {url.path}"}
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+async def serve_connection(dataset, reader, writer):
+    try:
+        header = await reader.readuntil(b"\r\n\r\n")
+        method, target, _ = header.decode('latin-1').split("\r\n", 1)[0].split(" ", 2)
+        try:
+            status, body = await handle_request(dataset, method.upper(), target)
+        except Exception as e:
+            status, body = 500, {"error": f"{type(e).__name__}: {e}"}
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError):
+        status, body = 400, {"error": "Petición HTTP no válida"}
+    payload = json.dumps(body, ensure_ascii=False, default=str).encode('utf-8')
+    writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                 f"Content-Type: application/json; charset=utf-8\r\n"
+                 f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode('latin-1') + payload)
+    try:
+        await writer.drain()
+    finally:
+        writer.close()
+
+async def serve(path, host="127.0.0.1", port=8765, unix_socket=None, workers=None, poll_interval=2.0,
+                use_cache=True):
+    """Carga los datos y atiende peticiones hasta que se interrumpa el proceso."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        dataset = SalesDataset(path, executor, use_cache)
+        await dataset.current()
+
+        def handler(reader, writer):
+            return serve_connection(dataset, reader, writer)
+
+        if unix_socket:
+            server = await asyncio.start_unix_server(handler, path=unix_socket, limit=MAX_HEADER_BYTES)
+            print(f"Servicio de validación escuchando en {unix_socket}")
+        else:
+            server = await asyncio.start_server(handler, host, port, limit=MAX_HEADER_BYTES)
+            print(f"Servicio de validación escuchando en http://{host}:{port}")
+        watcher = asyncio.create_task(dataset.watch(poll_interval)) if poll_interval else None
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if watcher:
+                watcher.cancel()
+            if unix_socket and os.path.exists(unix_socket):
+                os.remove(unix_socket)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servicio de validación de ventas con los datos en memoria")
+    parser.add_argument("--file", default=tests_cases.file_path, help="Archivo de ventas a validar")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", default=None, help="Escuchar en un socket Unix en lugar de TCP")
+    parser.add_argument("--workers", type=int, default=None, help="Hilos para los chequeos")
+    parser.add_argument("--poll-interval", type=float, default=2.0,
+                        help="Segundos entre revisiones del archivo de origen (0 = sólo al recibir peticiones)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Leer siempre el Excel en lugar de la caché columnar")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.file, args.host, args.port, args.unix_socket, args.workers, args.poll_interval,
+                          not args.no_cache))
+    except KeyboardInterrupt:
+        print("Servicio detenido")